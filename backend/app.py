@@ -1,14 +1,33 @@
 # backend/app.py - 한국 시간대로 통일
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, has_request_context, jsonify, request, send_from_directory, stream_with_context
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from flask_cors import CORS
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 import os
+import io
+import csv
+import json
 import base64
+import gzip
+import time
+import threading
 import uuid
+import re
+from collections import Counter, OrderedDict
+from functools import wraps
 from werkzeug.utils import secure_filename
 
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 사용
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack이 없으면 JSON만 사용
+    msgpack = None
+
 import hashlib
 import secrets
 from datetime import datetime, timedelta
@@ -34,15 +53,488 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# 데이터베이스 연결 함수
-def get_db_connection():
-    conn = psycopg2.connect(
+# 캠퍼스 설정 (school 파라미터가 없을 때 사용)
+DEFAULT_SCHOOL = os.environ.get('DEFAULT_SCHOOL', 'jungsu')
+
+# 데이터베이스 연결 설정
+DATABASE_URL = os.environ.get('DATABASE_URL')  # 주 DB (없으면 기본 접속 정보 사용)
+REPLICA_DATABASE_URLS = [u.strip() for u in os.environ.get('REPLICA_DATABASE_URLS', '').split(',') if u.strip()]
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))  # 이보다 복제 지연(초)이 크면 읽기에서 제외
+REPLICA_CHECK_INTERVAL = float(os.environ.get('REPLICA_CHECK_INTERVAL', 5))  # 복제 지연 확인 주기(초)
+READ_YOUR_WRITES_WINDOW = float(os.environ.get('READ_YOUR_WRITES_WINDOW', 10))  # 쓰기 후 주 DB에서 읽는 시간(초)
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 3))  # DB 연결 대기 시간(초)
+STATEMENT_TIMEOUT_MS = int(os.environ.get('STATEMENT_TIMEOUT_MS', 5000))  # 기본 쿼리 실행 제한 시간(ms)
+DB_POOL_MAX_IDLE = int(os.environ.get('DB_POOL_MAX_IDLE', 8))  # 접속 정보별로 재사용을 위해 남겨 둘 연결 수 (0이면 풀 사용 안 함)
+DB_POOL_IDLE_TIMEOUT = float(os.environ.get('DB_POOL_IDLE_TIMEOUT', 300))  # 이보다 오래 쉰 연결은 닫음(초)
+DB_POOL_PING_AFTER = float(os.environ.get('DB_POOL_PING_AFTER', 5))  # 이보다 오래 쉰 연결은 내주기 전에 SELECT 1로 확인(초)
+
+# API별 쿼리 실행 제한 시간(ms), 없으면 STATEMENT_TIMEOUT_MS
+ENDPOINT_STATEMENT_TIMEOUTS = {
+    'health_check': 1000,
+    'get_menu': 2000,
+    'get_like_status': 2000,
+    'get_posts': 3000,
+    'get_calendar_stats': 2000,
+    'get_post_detail': 3000,
+    'metrics': 3000,
+    'export_data': 30000,  # 서버 측 커서로 나눠 읽는 내보내기
+}
+
+def connect_primary(**kwargs):
+    if DATABASE_URL:
+        return db_pool.connect(DATABASE_URL, **kwargs)
+    return db_pool.connect(
         host="db",
         database="schoolmealdb",
         user="schoolmeal",
-        password="securepassword"
+        password="securepassword",
+        **kwargs
     )
-    return conn
+
+class ReplicaRouter:
+    """읽기 전용 요청을 복제 DB로 분산합니다.
+
+    복제 지연이 REPLICA_MAX_LAG를 넘거나 연결할 수 없는 복제본은 건너뛰고,
+    쓰기 요청을 보낸 사용자(세션 토큰/user_identifier 기준)는 READ_YOUR_WRITES_WINDOW 동안 주 DB에서 읽습니다.
+    사용할 수 있는 복제본이 없으면 주 DB를 사용합니다.
+    """
+    
+    LAG_QUERY = """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """
+    
+    def __init__(self, dsns):
+        self.replicas = [{'dsn': dsn, 'lag': None, 'healthy': True, 'checked_at': 0.0} for dsn in dsns]
+        self._next = 0
+        self._recent_writers = {}
+        self._lock = threading.Lock()
+    
+    def mark_write(self, writer_keys):
+        now = time.monotonic()
+        with self._lock:
+            for key in writer_keys:
+                self._recent_writers[key] = now + READ_YOUR_WRITES_WINDOW
+            # 만료된 항목 정리
+            if len(self._recent_writers) > 1000:
+                self._recent_writers = {k: v for k, v in self._recent_writers.items() if v > now}
+    
+    def recently_wrote(self, writer_keys):
+        now = time.monotonic()
+        with self._lock:
+            return any(self._recent_writers.get(key, 0) > now for key in writer_keys)
+    
+    def _candidates(self):
+        """라운드 로빈 순서의 복제본 목록"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(1, len(self.replicas))
+        return self.replicas[start:] + self.replicas[:start]
+    
+    def _check_lag(self, replica, conn):
+        with conn.cursor() as cur:
+            cur.execute(self.LAG_QUERY)
+            lag = float(cur.fetchone()[0])
+        conn.rollback()
+        replica.update(lag=lag, healthy=lag <= REPLICA_MAX_LAG, checked_at=time.monotonic())
+        if not replica['healthy']:
+            print(f"복제 지연 {lag:.1f}초, 읽기에서 제외")
+    
+    def connect(self, **kwargs):
+        kwargs.setdefault('connect_timeout', 2)
+        for replica in self._candidates():
+            stale = time.monotonic() - replica['checked_at'] >= REPLICA_CHECK_INTERVAL
+            if not replica['healthy'] and not stale:
+                continue
+            try:
+                conn = db_pool.connect(replica['dsn'], **kwargs)
+            except Exception as e:
+                print(f"복제 DB 연결 실패: {e}")
+                replica.update(healthy=False, checked_at=time.monotonic())
+                continue
+            try:
+                if stale:
+                    self._check_lag(replica, conn)
+            except Exception as e:
+                print(f"복제 지연 확인 실패: {e}")
+                replica.update(healthy=False, checked_at=time.monotonic())
+            if replica['healthy']:
+                return conn
+            conn.close()
+        return None
+
+replica_router = ReplicaRouter(REPLICA_DATABASE_URLS)
+
+def request_client_key():
+    """클라이언트 접속 주소 (클라이언트가 바꿀 수 있는 X-Forwarded-For는 사용하지 않음)"""
+    return request.remote_addr or ''
+
+def request_writer_keys():
+    """쓰기 후 읽기 일관성 키 목록: 접속 주소와, 요청에 실린 세션 토큰 / user_identifier
+
+    게시글 작성처럼 사용자 정보 없이 쓰고 ?user_identifier=를 붙여 조회하는 경우가 있어
+    접속 주소는 항상 키에 넣어 쓰기와 조회가 적어도 하나의 키로 맞물리게 합니다.
+    (같은 NAT 뒤의 다른 사용자도 잠시 주 DB에서 읽게 되지만 오래된 데이터를 읽지는 않음)
+    """
+    body = request.get_json(silent=True) if request.is_json else None
+    body = body if isinstance(body, dict) else {}
+    keys = []
+    session_token = get_request_session_token() or body.get('session_token')
+    if session_token:
+        keys.append('session:' + hashlib.sha256(str(session_token).encode()).hexdigest())
+    user_identifier = request.args.get('user_identifier') or body.get('user_identifier')
+    if user_identifier:
+        keys.append(f'user:{user_identifier}')
+    keys.append('addr:' + request_client_key())
+    return keys
+
+class StatementTimeoutCursor:
+    """쿼리 실행 제한 시간 초과를 집계하는 커서 (다른 커서 클래스와 함께 상속)"""
+    
+    def execute(self, query, vars=None):
+        try:
+            return super().execute(query, vars)
+        except psycopg2.extensions.QueryCanceledError:
+            admission.count_statement_timeout()
+            if has_request_context():
+                g.statement_timeout = True
+            raise
+
+_timeout_cursor_classes = {}
+
+class GuardedConnection(psycopg2.extensions.connection):
+    """cursor()가 항상 StatementTimeoutCursor를 섞은 커서를 만들도록 하는 연결
+
+    풀에서 받은 연결은 close()하면 실제로 닫지 않고 풀로 돌려보내며,
+    이 연결에 PREPARE된 문장 이름을 prepared에 기록합니다.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.pool_key = None
+        self.prepared = set()
+        self.statement_timeout = None  # 세션에 설정된 쿼리 실행 제한 시간(ms), None이면 서버 기본값
+    
+    def set_statement_timeout(self, timeout_ms):
+        """세션의 쿼리 실행 제한 시간 변경 (이미 같은 값이면 생략)
+
+        트랜잭션 밖에서 설정해야 이후 롤백되어도 값이 유지되므로 잠시 autocommit으로 실행합니다.
+        """
+        if timeout_ms == self.statement_timeout:
+            return
+        self.autocommit = True
+        try:
+            with self.cursor() as cur:
+                if timeout_ms is None:
+                    cur.execute("SET statement_timeout TO DEFAULT")
+                else:
+                    cur.execute("SET statement_timeout = %s", (int(timeout_ms),))
+        finally:
+            self.autocommit = False
+        self.statement_timeout = timeout_ms
+    
+    def close(self):
+        if self.pool is not None and self.pool.release(self):
+            return
+        if self.prepared:
+            prepared_statements.forget(self.prepared)
+            self.prepared = set()
+        super().close()
+    
+    def cursor(self, *args, **kwargs):
+        base = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+        cls = _timeout_cursor_classes.get(base)
+        if cls is None:
+            cls = _timeout_cursor_classes[base] = type(f'Guarded{base.__name__}', (StatementTimeoutCursor, base), {})
+        kwargs['cursor_factory'] = cls
+        return super().cursor(*args, **kwargs)
+
+class ConnectionPool:
+    """접속 정보(DSN)별로 쉬고 있는 연결을 보관했다가 재사용합니다.
+
+    동시 연결 수는 요청 수 제한(AdmissionControl)이 정하므로 여기서는 남겨 둘 연결 수만 제한합니다.
+    돌려받을 때 진행 중인 트랜잭션은 롤백합니다.
+    ping_after초보다 오래 쉰 연결은 내주기 전에 SELECT 1로 확인하고, 실패하면 DB 재시작이나
+    장애 조치로 보고 같은 접속 정보의 쉬는 연결을 모두 버린 뒤 새로 연결합니다.
+    API마다 다른 쿼리 실행 제한 시간은 연결을 내줄 때 SET으로 맞추므로 풀을 나누지 않습니다.
+    """
+    
+    def __init__(self, max_idle, idle_timeout, ping_after):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self._idle = {}  # 접속 정보 -> [(연결, 반납 시각)]
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0  # 확인에 실패해 버린 연결 수
+    
+    def connect(self, *args, statement_timeout=None, **kwargs):
+        kwargs['connection_factory'] = GuardedConnection
+        # 연결할 때만 쓰이는 connect_timeout은 세션에 영향이 없으므로 키에서 제외
+        key = repr((args, sorted((k, v) for k, v in kwargs.items() if k != 'connect_timeout')))
+        now = time.monotonic()
+        stale = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                candidate, released_at = idle.pop()
+                if now - released_at > self.idle_timeout or candidate.closed:
+                    stale.append(candidate)
+                    continue
+                conn = candidate
+                break
+        if conn is not None and now - released_at > self.ping_after and not self._ping(conn):
+            # 하나가 끊겼으면 같은 서버에 붙어 있던 나머지도 끊겼을 가능성이 높음
+            with self._lock:
+                dropped = [conn] + [old for old, _ in self._idle.pop(key, [])]
+                self.discarded += len(dropped)
+            stale += dropped
+            conn = None
+        for old in stale:
+            old.pool = None
+            try:
+                old.close()
+            except Exception:
+                pass
+        if conn is None:
+            conn = psycopg2.connect(*args, **kwargs)
+            with self._lock:
+                self.created += 1
+        else:
+            with self._lock:
+                self.reused += 1
+        conn.pool = self if self.max_idle > 0 else None
+        conn.pool_key = key
+        try:
+            conn.set_statement_timeout(statement_timeout)
+        except Exception:
+            conn.pool = None
+            conn.close()
+            raise
+        return conn
+    
+    @staticmethod
+    def _ping(conn):
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception as e:
+            print(f"풀 연결 확인 실패, 버림: {e}")
+            return False
+    
+    def release(self, conn):
+        """연결을 풀로 돌려보냄 (보관하지 못하면 False, 호출한 쪽에서 닫음)"""
+        try:
+            if conn.closed or conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            return False
+        with self._lock:
+            idle = self._idle.setdefault(conn.pool_key, [])
+            if len(idle) >= self.max_idle:
+                return False
+            idle.append((conn, time.monotonic()))
+            return True
+    
+    def idle_count(self):
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+db_pool = ConnectionPool(DB_POOL_MAX_IDLE, DB_POOL_IDLE_TIMEOUT, DB_POOL_PING_AFTER)
+
+class PreparedStatements:
+    """자주 쓰는 SQL을 연결마다 한 번만 PREPARE하고 이후에는 EXECUTE로 실행합니다.
+
+    SQL은 다른 쿼리처럼 %s 자리표시자로 등록합니다. 연결이 풀에서 재사용되는 동안
+    Postgres가 파싱/계획 결과를 다시 씁니다.
+    """
+    
+    def __init__(self):
+        self._statements = {}  # 이름 -> (PREPARE할 SQL, 파라미터 수)
+        self._lock = threading.Lock()
+        self.prepares = Counter()  # 이름별 PREPARE 횟수
+        self.executions = Counter()  # 이름별 EXECUTE 횟수
+        self.active = Counter()  # 이름별 현재 PREPARE된 연결 수
+    
+    def register(self, name, sql):
+        counter = iter(range(1, sql.count('%s') + 1))
+        self._statements[name] = (re.sub(r'%s', lambda m: f'${next(counter)}', sql), sql.count('%s'))
+        return name
+    
+    def execute(self, cur, name, params=()):
+        sql, param_count = self._statements[name]
+        conn = cur.connection
+        if name not in conn.prepared:
+            cur.execute(f"PREPARE {name} AS {sql}")
+            conn.prepared.add(name)
+            with self._lock:
+                self.prepares[name] += 1
+                self.active[name] += 1
+        if param_count:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * param_count)})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
+        with self._lock:
+            self.executions[name] += 1
+    
+    def forget(self, names):
+        """연결이 닫혀 사라진 문장 기록"""
+        with self._lock:
+            for name in names:
+                self.active[name] -= 1
+    
+    def names(self):
+        return sorted(self._statements)
+
+prepared_statements = PreparedStatements()
+
+def connection_options():
+    """연결 대기 시간과 현재 API의 쿼리 실행 제한 시간을 담은 연결 인자"""
+    timeout_ms = STATEMENT_TIMEOUT_MS
+    if has_request_context():
+        timeout_ms = ENDPOINT_STATEMENT_TIMEOUTS.get(request.endpoint, STATEMENT_TIMEOUT_MS)
+    return {
+        'connect_timeout': DB_CONNECT_TIMEOUT,
+        'statement_timeout': timeout_ms,
+    }
+
+# 데이터베이스 연결 함수
+def get_db_connection(readonly=False):
+    """DB 연결 반환 (readonly=True이면 가능한 경우 복제 DB 사용)"""
+    options = connection_options()
+    if readonly and replica_router.replicas and has_request_context() \
+            and not replica_router.recently_wrote(request_writer_keys()):
+        conn = replica_router.connect(**options)
+        if conn is not None:
+            return conn
+    return connect_primary(**options)
+
+@app.after_request
+def track_writes(response):
+    """쓰기에 성공한 사용자는 잠시 동안 주 DB에서 읽도록 기록"""
+    if request.method in ('POST', 'PUT', 'PATCH', 'DELETE') and response.status_code < 400 \
+            and replica_router.replicas:
+        replica_router.mark_write(request_writer_keys())
+    return response
+
+# ===== 과부하 보호 (동시 요청 제한 / 부하 차단) =====
+
+MAX_INFLIGHT = int(os.environ.get('MAX_INFLIGHT', 32))  # 동시에 처리할 최대 요청 수
+CHEAP_RESERVED = int(os.environ.get('CHEAP_RESERVED', 4))  # 이 중 가벼운 조회만 쓸 수 있는 자리
+MAX_EXPENSIVE_INFLIGHT = int(os.environ.get('MAX_EXPENSIVE_INFLIGHT', 8))  # 쓰기/업로드 최대 동시 처리 수
+MAX_EXPORT_INFLIGHT = int(os.environ.get('MAX_EXPORT_INFLIGHT', 2))  # 내보내기 최대 동시 처리 수 (스트림이 끝날 때까지 자리 점유)
+ADMISSION_WAIT = float(os.environ.get('ADMISSION_WAIT', 0.5))  # 자리가 없을 때 기다리는 최대 시간(초)
+OVERLOAD_RETRY_AFTER = int(os.environ.get('OVERLOAD_RETRY_AFTER', 2))  # 503 응답의 Retry-After(초)
+
+# 항상 먼저 처리하는 가벼운 조회
+CHEAP_ENDPOINTS = {'hello', 'health_check', 'get_menu', 'serve_image', 'metrics'}
+
+def request_class():
+    """요청 분류: cheap(가벼운 조회) / normal(일반 조회) / expensive(쓰기, 업로드) / export(내보내기)"""
+    if request.method == 'OPTIONS' or request.endpoint in CHEAP_ENDPOINTS:
+        return 'cheap'
+    if request.endpoint == 'export_data':
+        return 'export'
+    if request.method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+        return 'expensive'
+    return 'normal'
+
+class AdmissionControl:
+    """분류별 동시 처리 수를 제한합니다.
+
+    가벼운 조회는 전체 MAX_INFLIGHT를 쓸 수 있고, 나머지는 CHEAP_RESERVED 자리를 남겨 두며
+    비싼 요청은 MAX_EXPENSIVE_INFLIGHT, 내보내기는 따로 MAX_EXPORT_INFLIGHT까지만 처리합니다.
+    (오래 걸리는 내보내기가 쓰기 자리를 차지하지 않도록 분리) 자리가 없으면 잠시 기다리고,
+    그래도 없으면 거절합니다.
+    """
+    
+    CLASSES = ('cheap', 'normal', 'expensive', 'export')
+    
+    def __init__(self, max_inflight, cheap_reserved, max_expensive, max_export):
+        self.max_inflight = max_inflight
+        self.cheap_reserved = cheap_reserved
+        self.max_expensive = max_expensive
+        self.max_export = max_export
+        self.inflight = {c: 0 for c in self.CLASSES}
+        self.admitted = {c: 0 for c in self.CLASSES}
+        self.queued = {c: 0 for c in self.CLASSES}
+        self.shed = {c: 0 for c in self.CLASSES}
+        self.statement_timeouts = 0
+        self._cond = threading.Condition()
+    
+    def _has_room(self, cls):
+        total = sum(self.inflight.values())
+        if cls == 'cheap':
+            return total < self.max_inflight
+        if cls == 'expensive' and self.inflight['expensive'] >= self.max_expensive:
+            return False
+        if cls == 'export' and self.inflight['export'] >= self.max_export:
+            return False
+        return total < self.max_inflight - self.cheap_reserved
+    
+    def acquire(self, cls, wait):
+        with self._cond:
+            if not self._has_room(cls):
+                self.queued[cls] += 1
+                deadline = time.monotonic() + wait
+                while not self._has_room(cls):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed[cls] += 1
+                        return False
+                    self._cond.wait(remaining)
+            self.inflight[cls] += 1
+            self.admitted[cls] += 1
+            return True
+    
+    def release(self, cls):
+        with self._cond:
+            self.inflight[cls] -= 1
+            self._cond.notify_all()
+    
+    def count_statement_timeout(self):
+        with self._cond:
+            self.statement_timeouts += 1
+
+admission = AdmissionControl(MAX_INFLIGHT, CHEAP_RESERVED, MAX_EXPENSIVE_INFLIGHT, MAX_EXPORT_INFLIGHT)
+
+def overloaded_response(message):
+    response = jsonify({"error": message})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(OVERLOAD_RETRY_AFTER)
+    return response
+
+@app.before_request
+def admit_request():
+    """처리 중인 요청이 많으면 빠르게 503으로 거절"""
+    cls = request_class()
+    if not admission.acquire(cls, ADMISSION_WAIT):
+        return overloaded_response("Server is busy, please retry later")
+    g.admission_class = cls
+
+@app.teardown_request
+def release_request(exc):
+    cls = g.pop('admission_class', None)
+    if cls:
+        admission.release(cls)
+
+@app.after_request
+def statement_timeout_response(response):
+    """쿼리 실행 제한 시간 초과로 실패한 요청은 500 대신 503 + Retry-After"""
+    if g.get('statement_timeout') and response.status_code == 500:
+        return overloaded_response("Database is busy, please retry later")
+    return response
 
 # 한국 시간 변환 헬퍼 함수
 def convert_to_kst_string(dt):
@@ -95,10 +587,215 @@ def process_time_fields(data):
                         # 파싱 실패하면 원본 유지
                         pass
         
+        # /api/me/* 의 {"items": [...]} 목록도 같은 형식으로 (datetime 객체만, 날짜 문자열은 그대로 둠)
+        if isinstance(result.get('items'), list):
+            result['items'] = [
+                {key: convert_to_kst_string(value) if isinstance(value, datetime) else value
+                 for key, value in item.items()} if isinstance(item, dict) else item
+                for item in result['items']
+            ]
+        
         return result
     else:
         return data
 
+# ===== 응답 압축 / 캐시 =====
+
+# 압축 설정
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))  # 이보다 작은 응답은 압축하지 않음
+COMPRESS_MIMETYPES = {'application/json', 'application/msgpack', 'text/plain', 'text/csv', 'application/x-ndjson'}
+MENU_CACHE_TTL = int(os.environ.get('MENU_CACHE_TTL', 60))  # 메뉴 응답 캐시 유지 시간(초)
+FEED_CACHE_TTL = int(os.environ.get('FEED_CACHE_TTL', 30))  # 게시글 목록 캐시 유지 시간(초, 다른 워커의 쓰기가 반영되는 최대 지연)
+FEED_CACHE_SIZE = int(os.environ.get('FEED_CACHE_SIZE', 256))  # 게시글 목록 캐시 최대 항목 수 (초과 시 가장 오래 안 쓴 항목 제거)
+
+def negotiate_encoding(accept_encoding):
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (br > gzip, q=0은 제외)"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    
+    for encoding in (('br', 'gzip') if brotli else ('gzip',)):
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+def compress_body(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+class CachedBody:
+    """직렬화된 응답 본문과 인코딩별 압축 결과 (압축은 인코딩마다 한 번만 수행)"""
+    
+    def __init__(self, body, mimetype='application/json'):
+        self.body = body
+        self.mimetype = mimetype
+        self._encoded = {}
+    
+    def encoded(self, encoding):
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress_body(self.body, encoding)
+        return self._encoded[encoding]
+    
+    def to_response(self):
+        """요청의 Accept-Encoding에 맞춰 (필요하면 미리 압축된) 응답 생성"""
+        encoding = None
+        if len(self.body) >= COMPRESS_MIN_SIZE:
+            encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+        
+        response = Response(self.encoded(encoding) if encoding else self.body, mimetype=self.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+class ResponseCache:
+    """키별 CachedBody를 TTL 동안 보관하는 프로세스 내 캐시
+
+    max_entries를 주면 가장 오래 사용하지 않은 항목부터 제거합니다. (LRU)
+    키는 튜플이며 invalidate_prefix로 앞부분이 같은 키를 한 번에 무효화할 수 있습니다.
+    """
+    
+    def __init__(self, ttl, max_entries=None, hold=0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hold = hold  # 무효화 후 이 시간(초) 동안 시작된 조회 결과는 저장하지 않음 (복제 지연 대비)
+        self._entries = OrderedDict()
+        self._invalidated = {}  # 무효화된 키(앞부분) -> 무효화 시각
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, cached = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+    
+    def set(self, key, cached, started=None):
+        """started(조회 시작 시각, time.monotonic)를 주면 그 뒤에 무효화된 키는 저장하지 않음"""
+        with self._lock:
+            if started is not None:
+                for n in range(len(key) + 1):  # () = 전체 무효화
+                    invalidated_at = self._invalidated.get(key[:n])
+                    if invalidated_at is not None and invalidated_at + self.hold >= started:
+                        return
+            self._entries[key] = (time.monotonic() + self.ttl, cached)
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key):
+        self.invalidate_prefix(key)
+    
+    def invalidate_prefix(self, prefix):
+        """앞부분이 prefix인 모든 키를 무효화"""
+        now = time.monotonic()
+        with self._lock:
+            for key in [k for k in self._entries if k[:len(prefix)] == prefix]:
+                del self._entries[key]
+                self.invalidations += 1
+            self._invalidated[prefix] = now
+            # 진행 중인 조회에 더 이상 영향이 없는 오래된 무효화 기록 정리
+            for old in [k for k, t in self._invalidated.items() if t + self.hold + self.ttl < now]:
+                del self._invalidated[old]
+    
+    def __len__(self):
+        return len(self._entries)
+
+menu_cache = ResponseCache(MENU_CACHE_TTL)
+
+# 게시글 목록 캐시: (meal_date, meal_type, 응답 형식) -> 직렬화된 목록, (meal_date, meal_type, 'rows') -> 목록 행
+# 복제 DB를 쓰면 무효화 직후 복제 DB에서 읽은 이전 목록이 다시 저장되지 않도록 복제 허용 지연만큼 저장 보류
+feed_cache = ResponseCache(FEED_CACHE_TTL, max_entries=FEED_CACHE_SIZE,
+                           hold=REPLICA_MAX_LAG if REPLICA_DATABASE_URLS else 0)
+
+def feed_key(meal_date, meal_type):
+    """게시글 목록 캐시 키 앞부분 (date 객체와 'YYYY-MM-DD' 문자열을 같은 키로, 조회 쪽은 date로 정규화해서 호출)"""
+    return (str(meal_date)[:10], meal_type)
+
+def invalidate_feed(meal_date, meal_type):
+    """해당 날짜/식사의 게시글 목록 캐시 무효화 (쓰기 커밋 후 호출)"""
+    feed_cache.invalidate_prefix(feed_key(meal_date, meal_type))
+
+# ===== 응답 형식 (JSON / MessagePack) =====
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+def response_format():
+    """Accept 헤더로 응답 형식 결정 (기본값 JSON)"""
+    if msgpack is None:
+        return 'json'
+    best = request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE])
+    return 'msgpack' if best == MSGPACK_MIMETYPE else 'json'
+
+def prepare_msgpack(data):
+    """MessagePack 직렬화용 변환: 시간은 timestamp 확장 타입, 날짜는 YYYY-MM-DD 문자열"""
+    if isinstance(data, list):
+        return [prepare_msgpack(item) for item in data]
+    if isinstance(data, dict):
+        return {key: prepare_msgpack(value) for key, value in data.items()}
+    if isinstance(data, datetime):
+        # naive datetime은 UTC로 가정 (convert_to_kst_string과 동일)
+        return data if data.tzinfo else data.replace(tzinfo=timezone.utc)
+    if hasattr(data, 'isoformat'):
+        return data.isoformat()
+    return data
+
+def serialize_body(data):
+    """요청된 형식으로 직렬화한 CachedBody 반환"""
+    if response_format() == 'msgpack':
+        return CachedBody(msgpack.packb(prepare_msgpack(data), datetime=True), MSGPACK_MIMETYPE)
+    # JSON은 기존처럼 시간 필드를 한국 시간 문자열로 변환
+    return CachedBody(jsonify(process_time_fields(data)).get_data())
+
+def render_response(data, status=200):
+    """조회 API 공통 응답 (Accept: application/msgpack이면 MessagePack, 아니면 JSON)"""
+    response = serialize_body(data).to_response()
+    response.status_code = status
+    response.vary.add('Accept')
+    return response
+
+@app.after_request
+def compress_response(response):
+    """캐시를 거치지 않은 일반 응답도 크기가 충분하면 압축"""
+    if (response.mimetype not in COMPRESS_MIMETYPES
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    if encoding:
+        response.set_data(compress_body(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.route('/')
 def hello():
     return "Hello, World!"
@@ -107,23 +804,635 @@ def hello():
 def health_check():
     return jsonify({"status": "healthy"})
 
+# 모니터링 지표 (Prometheus 텍스트 형식)
+def format_metric(name, value, labels=None):
+    """지표 한 줄을 Prometheus 텍스트 형식으로 변환 (값이 없으면 생략)"""
+    if value is None:
+        return []
+    label_str = ''
+    if labels:
+        label_str = '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}'
+    return [f"{name}{label_str} {value}"]
+
+def crawl_metrics():
+    """crawl_runs 테이블의 캠퍼스별 최근 실행 결과와 누적 횟수"""
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute("""
+        SELECT DISTINCT ON (school) *
+        FROM crawl_runs
+        ORDER BY school, started_at DESC
+    """)
+    latest = cur.fetchall()
+    cur.execute("""
+        SELECT school,
+               COUNT(*) AS runs,
+               COUNT(*) FILTER (WHERE fallback) AS fallbacks,
+               COUNT(*) FILTER (WHERE error IS NOT NULL) AS errors
+        FROM crawl_runs
+        GROUP BY school
+    """)
+    totals = cur.fetchall()
+    cur.close()
+    conn.close()
+    
+    lines = []
+    for row in totals:
+        labels = {'school': row['school']}
+        lines += format_metric('schoolmeal_crawl_runs_total', row['runs'], labels)
+        lines += format_metric('schoolmeal_crawl_fallbacks_total', row['fallbacks'], labels)
+        lines += format_metric('schoolmeal_crawl_errors_total', row['errors'], labels)
+    for row in latest:
+        labels = {'school': row['school']}
+        for stage in ('fetch', 'parse', 'save', 'total'):
+            lines += format_metric('schoolmeal_crawl_last_stage_ms', row[f'{stage}_ms'], dict(labels, stage=stage))
+        lines += format_metric('schoolmeal_crawl_last_bytes', row['bytes_fetched'], labels)
+        for kind in ('parsed', 'skipped', 'inserted', 'updated', 'unchanged'):
+            lines += format_metric('schoolmeal_crawl_last_rows', row[f'rows_{kind}'], dict(labels, kind=kind))
+        lines += format_metric('schoolmeal_crawl_last_fallback', int(row['fallback']), labels)
+        lines += format_metric('schoolmeal_crawl_last_timestamp_seconds',
+                               row['started_at'].replace(tzinfo=timezone.utc).timestamp(), labels)
+    return lines
+
+def replica_metrics():
+    """복제 DB별 마지막으로 확인한 복제 지연과 사용 가능 여부"""
+    lines = []
+    for i, replica in enumerate(replica_router.replicas):
+        labels = {'replica': str(i)}
+        lines += format_metric('schoolmeal_replica_lag_seconds', replica['lag'], labels)
+        lines += format_metric('schoolmeal_replica_healthy', int(replica['healthy']), labels)
+    return lines
+
+def cache_metrics():
+    """응답 캐시별 적중/실패/제거/무효화 횟수와 현재 항목 수 (이 워커 기준)"""
+    lines = []
+    for name, cache in (('menu', menu_cache), ('feed', feed_cache)):
+        labels = {'cache': name}
+        lines += format_metric('schoolmeal_cache_hits_total', cache.hits, labels)
+        lines += format_metric('schoolmeal_cache_misses_total', cache.misses, labels)
+        lines += format_metric('schoolmeal_cache_evictions_total', cache.evictions, labels)
+        lines += format_metric('schoolmeal_cache_invalidations_total', cache.invalidations, labels)
+        lines += format_metric('schoolmeal_cache_entries', len(cache), labels)
+    return lines
+
+def db_metrics():
+    """연결 풀과 PREPARE된 문장별 실행 횟수 (이 워커 기준)"""
+    lines = []
+    lines += format_metric('schoolmeal_db_connections_created_total', db_pool.created)
+    lines += format_metric('schoolmeal_db_connections_reused_total', db_pool.reused)
+    lines += format_metric('schoolmeal_db_connections_discarded_total', db_pool.discarded)
+    lines += format_metric('schoolmeal_db_connections_idle', db_pool.idle_count())
+    for name in prepared_statements.names():
+        labels = {'statement': name}
+        lines += format_metric('schoolmeal_prepared_statement_connections', prepared_statements.active[name], labels)
+        lines += format_metric('schoolmeal_prepared_statement_prepares_total', prepared_statements.prepares[name], labels)
+        lines += format_metric('schoolmeal_prepared_statement_executions_total', prepared_statements.executions[name], labels)
+    return lines
+
+def image_job_metrics():
+    """이미지 후처리 큐의 대기/처리 중 작업 수와 이 워커의 처리 결과 수"""
+    conn = get_db_connection(readonly=True)
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute("""
+        SELECT status, COUNT(*) AS jobs
+        FROM image_jobs
+        WHERE status IN ('pending', 'processing')
+        GROUP BY status
+    """)
+    queued = {row['status']: row['jobs'] for row in cur.fetchall()}
+    cur.close()
+    conn.close()
+    
+    lines = []
+    for status in ('pending', 'processing'):
+        lines += format_metric('schoolmeal_image_jobs_queued', queued.get(status, 0), {'status': status})
+    for result in ('enqueued', 'processed', 'retried', 'failed'):
+        lines += format_metric('schoolmeal_image_jobs_total', getattr(image_jobs, result), {'result': result})
+    return lines
+
+def admission_metrics():
+    """분류별 처리 중/허용/대기/거절 요청 수와 쿼리 시간 초과 횟수 (이 워커 기준)"""
+    lines = []
+    for cls in admission.CLASSES:
+        labels = {'class': cls}
+        lines += format_metric('schoolmeal_requests_inflight', admission.inflight[cls], labels)
+        lines += format_metric('schoolmeal_requests_admitted_total', admission.admitted[cls], labels)
+        lines += format_metric('schoolmeal_requests_queued_total', admission.queued[cls], labels)
+        lines += format_metric('schoolmeal_requests_shed_total', admission.shed[cls], labels)
+    lines += format_metric('schoolmeal_statement_timeouts_total', admission.statement_timeouts)
+    return lines
+
+@app.route('/api/metrics')
+def metrics():
+    """모니터링 지표 조회"""
+    try:
+        lines = (crawl_metrics() + replica_metrics() + cache_metrics() + admission_metrics() + db_metrics()
+                 + image_job_metrics())
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/menu')
 def get_menu():
     try:
-        conn = get_db_connection()
+        school = request.args.get('school', DEFAULT_SCHOOL)
+        
+        # 캐시된 응답이 있으면 (압축본 포함) 그대로 사용
+        cache_key = (school, response_format())
+        cached = menu_cache.get(cache_key)
+        if cached:
+            response = cached.to_response()
+            response.vary.add('Accept')
+            return response
+        
+        conn = get_db_connection(readonly=True)
         cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute('SELECT * FROM meal_menu ORDER BY date DESC;')
+        cur.execute('SELECT * FROM meal_menu WHERE school = %s ORDER BY date DESC;', (school,))
         menus = cur.fetchall()
         cur.close()
         conn.close()
         
-        # 시간 필드 변환
-        processed_menus = process_time_fields(list(menus))
+        cached = serialize_body(list(menus))
+        menu_cache.set(cache_key, cached)
+        response = cached.to_response()
+        response.vary.add('Accept')
+        return response
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# 음식 검색/통계 조회 기간 파라미터 (기본값: 최근 30일)
+def parse_date_range(default_days=30):
+    today = datetime.now(KST).date()
+    date_to = request.args.get('to') or today.isoformat()
+    date_from = request.args.get('from') or (today - timedelta(days=default_days)).isoformat()
+    return date_from, date_to
+
+# 음식별 제공 날짜 조회 API
+@app.route('/api/menu/dishes')
+def get_dish_dates():
+    """특정 음식이 나온 날짜 목록 조회 (menu_items 음식 색인 사용)"""
+    try:
+        dish = request.args.get('name')
+        if not dish:
+            return jsonify({"error": "name parameter is required"}), 400
+        
+        school = request.args.get('school', DEFAULT_SCHOOL)
+        date_from, date_to = parse_date_range()
+        
+        conn = get_db_connection(readonly=True)
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT date, meal_type
+            FROM menu_items
+            WHERE dish = %s AND school = %s AND date BETWEEN %s AND %s
+            ORDER BY date DESC, meal_type
+        """, (dish, school, date_from, date_to))
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        
+        return render_response({
+            "dish": dish,
+            "from": date_from,
+            "to": date_to,
+            "count": len(rows),
+            "dates": [{"date": row['date'].isoformat(), "meal_type": row['meal_type']} for row in rows]
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# 자주 나온 음식 통계 API
+@app.route('/api/menu/dishes/stats')
+def get_dish_stats():
+    """기간 내 식사 유형별로 자주 나온 음식 순위 조회"""
+    try:
+        meal_type = request.args.get('meal_type')
+        if not meal_type:
+            return jsonify({"error": "meal_type parameter is required"}), 400
+        
+        school = request.args.get('school', DEFAULT_SCHOOL)
+        limit = min(request.args.get('limit', 10, type=int), 100)
+        date_from, date_to = parse_date_range()
+        
+        conn = get_db_connection(readonly=True)
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT dish, COUNT(*) AS count
+            FROM menu_items
+            WHERE school = %s AND meal_type = %s AND date BETWEEN %s AND %s
+            GROUP BY dish
+            ORDER BY count DESC, dish
+            LIMIT %s
+        """, (school, meal_type, date_from, date_to, limit))
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        
+        return render_response({
+            "meal_type": meal_type,
+            "from": date_from,
+            "to": date_to,
+            "dishes": [dict(row) for row in rows]
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# 크롤링 즉시 실행 요청 API (크롤러가 LISTEN 중인 채널로 NOTIFY)
+CRAWL_CHANNEL = 'crawl_requests'
+CRAWL_TRIGGER_TOKEN = os.environ.get('CRAWL_TRIGGER_TOKEN')
+
+@app.route('/api/crawl/trigger', methods=['POST'])
+def trigger_crawl():
+    """크롤러에 즉시 크롤링 요청 (X-Crawl-Token 헤더 필요)"""
+    try:
+        if not CRAWL_TRIGGER_TOKEN:
+            return jsonify({"error": "Crawl trigger is disabled"}), 403
+        
+        token = request.headers.get('X-Crawl-Token', '')
+        if not secrets.compare_digest(token, CRAWL_TRIGGER_TOKEN):
+            return jsonify({"error": "Invalid crawl token"}), 401
+        
+        data = request.get_json(silent=True) or {}
+        school = data.get('school', '')  # 비어 있으면 전체 캠퍼스
+        
+        conn = get_db_connection()
+        cur = conn.cursor()
+        cur.execute("SELECT pg_notify(%s, %s)", (CRAWL_CHANNEL, school))
+        conn.commit()
+        cur.close()
+        conn.close()
         
-        return jsonify(processed_menus)
+        return jsonify({"message": "Crawl requested", "school": school or None}), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# ===== 멱등 키 (Idempotency-Key) =====
+
+IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 24 * 3600))  # 첫 응답 보관 시간(초)
+IDEMPOTENCY_CLEANUP_INTERVAL = int(os.environ.get('IDEMPOTENCY_CLEANUP_INTERVAL', 600))  # 만료 키 정리 주기(초)
+IDEMPOTENCY_CLEANUP_BATCH = int(os.environ.get('IDEMPOTENCY_CLEANUP_BATCH', 500))  # 한 번에 지울 만료 키 수
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))  # 처리 중 상태로 남은 키를 다시 쓸 수 있기까지(초)
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+idempotency_cleanup_lock = threading.Lock()
+idempotency_cleanup_at = 0.0  # 마지막 정리 시각 (time.monotonic)
+
+def idempotency_owner():
+    """멱등 키 소유자: 세션 토큰이 있으면 토큰 해시, 없으면 클라이언트 주소"""
+    session_token = get_request_session_token() or (request.get_json(silent=True) or {}).get('session_token')
+    if session_token:
+        return 'session:' + hashlib.sha256(session_token.encode()).hexdigest()[:48]
+    return 'client:' + request_client_key()[:56]
+
+def cleanup_idempotency_keys(batch_size=IDEMPOTENCY_CLEANUP_BATCH):
+    """만료된 멱등 키를 batch_size개씩 나눠 삭제 (한 번에 오래 잠그지 않도록)"""
+    total = 0
+    conn = connect_primary(connect_timeout=DB_CONNECT_TIMEOUT)
+    try:
+        with conn.cursor() as cur:
+            while True:
+                cur.execute("""
+                    DELETE FROM idempotency_keys
+                    WHERE ctid IN (
+                        SELECT ctid FROM idempotency_keys
+                        WHERE expires_at < %s
+                        LIMIT %s
+                    )
+                """, (datetime.now(KST), batch_size))
+                conn.commit()
+                total += cur.rowcount
+                if cur.rowcount < batch_size:
+                    break
+    except Exception as e:
+        print(f"멱등 키 정리 오류: {e}")
+    finally:
+        conn.close()
+    return total
+
+def schedule_idempotency_cleanup():
+    """정리 주기가 지났으면 백그라운드 스레드에서 만료 키 정리"""
+    global idempotency_cleanup_at
+    now = time.monotonic()
+    with idempotency_cleanup_lock:
+        if now - idempotency_cleanup_at < IDEMPOTENCY_CLEANUP_INTERVAL:
+            return
+        idempotency_cleanup_at = now
+    threading.Thread(target=cleanup_idempotency_keys, daemon=True).start()
+
+def reserve_idempotency_key(owner, key, request_hash):
+    """키를 예약하고 커밋. 예약했으면 None, 이미 있으면 저장된 행 반환"""
+    now = datetime.now(KST)
+    conn = get_db_connection()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        # 만료된 키나 처리 중에 멈춘 키(IDEMPOTENCY_LOCK_TIMEOUT 초과)는 새 요청으로 취급
+        cur.execute("""
+            INSERT INTO idempotency_keys (owner, idempotency_key, endpoint, request_hash, created_at, expires_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (owner, idempotency_key) DO UPDATE
+            SET endpoint = EXCLUDED.endpoint, request_hash = EXCLUDED.request_hash,
+                status_code = NULL, mimetype = NULL, response_body = NULL,
+                created_at = EXCLUDED.created_at, expires_at = EXCLUDED.expires_at
+            WHERE idempotency_keys.expires_at < %s
+               OR (idempotency_keys.status_code IS NULL AND idempotency_keys.created_at < %s)
+            RETURNING owner
+        """, (owner, key, request.endpoint, request_hash, now, now + timedelta(seconds=IDEMPOTENCY_TTL),
+              now, now - timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT)))
+        reserved = cur.fetchone()
+        conn.commit()
+        if reserved:
+            return None
+        
+        cur.execute("""
+            SELECT request_hash, status_code, mimetype, response_body
+            FROM idempotency_keys
+            WHERE owner = %s AND idempotency_key = %s
+        """, (owner, key))
+        return cur.fetchone() or {'request_hash': request_hash, 'status_code': None}
+    finally:
+        cur.close()
+        conn.close()
+
+def finish_idempotency_key(owner, key, response):
+    """첫 응답 저장 (응답이 없거나 서버 오류면 키를 지워 재시도 허용)"""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        if response is None or response.status_code >= 500:
+            cur.execute("DELETE FROM idempotency_keys WHERE owner = %s AND idempotency_key = %s", (owner, key))
+        else:
+            cur.execute("""
+                UPDATE idempotency_keys
+                SET status_code = %s, mimetype = %s, response_body = %s
+                WHERE owner = %s AND idempotency_key = %s
+            """, (response.status_code, response.mimetype, psycopg2.Binary(response.get_data()), owner, key))
+        conn.commit()
+    finally:
+        cur.close()
+        conn.close()
+
+def idempotent(view):
+    """Idempotency-Key 헤더가 있으면 같은 키의 재요청에 첫 응답을 그대로 돌려주는 데코레이터
+
+    첫 요청은 키를 먼저 예약(커밋)한 뒤 처리하고 처리 결과를 저장합니다.
+    처리 중인 키로 다시 요청하면 409, 같은 키에 다른 요청 본문이면 422를 반환합니다.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            return jsonify({"error": f"Idempotency-Key must be at most {MAX_IDEMPOTENCY_KEY_LENGTH} characters"}), 400
+        
+        try:
+            schedule_idempotency_cleanup()
+            owner = idempotency_owner()
+            request_hash = hashlib.sha256(request.path.encode() + b'\0' + request.get_data()).hexdigest()
+            stored = reserve_idempotency_key(owner, key, request_hash)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        
+        if stored is not None:
+            if stored['request_hash'] != request_hash:
+                return jsonify({"error": "Idempotency-Key was already used with a different request"}), 422
+            if stored['status_code'] is None:
+                response = jsonify({"error": "A request with this Idempotency-Key is still in progress"})
+                response.status_code = 409
+                response.headers['Retry-After'] = '1'
+                return response
+            response = Response(bytes(stored['response_body']), status=stored['status_code'],
+                                mimetype=stored['mimetype'])
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        
+        response = None
+        try:
+            response = app.make_response(view(*args, **kwargs))
+            return response
+        finally:
+            try:
+                finish_idempotency_key(owner, key, response)
+            except Exception as e:
+                print(f"멱등 키 응답 저장 오류: {e}")
+    return wrapper
+
+# ===== 업로드 이미지 후처리 (작업 큐) =====
+
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))  # 이미지 처리 프로세스 수 (0이면 작업만 등록하고 처리하지 않음)
+IMAGE_JOB_POLL_INTERVAL = float(os.environ.get('IMAGE_JOB_POLL_INTERVAL', 5))  # 새 작업 알림이 없을 때 큐 확인 주기(초)
+IMAGE_JOB_MAX_ATTEMPTS = int(os.environ.get('IMAGE_JOB_MAX_ATTEMPTS', 3))  # 이 횟수만큼 실패하면 failed로 남김
+IMAGE_JOB_RETRY_DELAY = int(os.environ.get('IMAGE_JOB_RETRY_DELAY', 30))  # 실패 후 재시도 대기(초, 시도마다 두 배)
+IMAGE_JOB_LOCK_TIMEOUT = int(os.environ.get('IMAGE_JOB_LOCK_TIMEOUT', 300))  # 처리 중으로 남은 작업을 다시 가져가기까지(초)
+IMAGE_MAX_SIDE = int(os.environ.get('IMAGE_MAX_SIDE', 1600))  # 처리된 이미지의 긴 변 최대 길이(px)
+
+def image_path(image_url):
+    """/images/<파일명> URL에 해당하는 업로드 폴더 경로"""
+    return os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(image_url.rsplit('/', 1)[-1]))
+
+def process_image_file(filepath, max_side=IMAGE_MAX_SIDE):
+    """이미지 방향(EXIF) 보정, 메타데이터 제거, 크기 제한 후 다시 인코딩 (작업 프로세스에서 실행)
+
+    (너비, 높이, 처리된 파일명)을 반환합니다. 움직이는 GIF는 프레임 유지를 위해 크기만 기록합니다.
+    """
+    from PIL import Image, ImageOps  # 작업 프로세스에서만 필요
+    
+    with Image.open(filepath) as original:
+        if getattr(original, 'is_animated', False):
+            return original.width, original.height, None
+        image_format = original.format
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((max_side, max_side))
+        
+        save_options = {}
+        if image_format == 'JPEG':
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            save_options = {'quality': 85, 'optimize': True, 'progressive': True}
+        elif image_format == 'PNG':
+            save_options = {'optimize': True}
+        
+        # exif 등 메타데이터는 save에 넘기지 않으면 저장되지 않음
+        stem, ext = os.path.splitext(os.path.basename(filepath))
+        processed = f"{stem}_processed{ext}"
+        dest = os.path.join(os.path.dirname(filepath), processed)
+        image.save(dest + '.tmp', format=image_format, **save_options)
+        os.replace(dest + '.tmp', dest)
+        return image.width, image.height, processed
+
+class ImageJobQueue:
+    """image_jobs 테이블 기반 작업 큐
+
+    업로드 API는 enqueue()로 작업만 등록하고 바로 응답하며, 디스패처 스레드가 작업을 가져와
+    프로세스 풀에서 처리한 뒤 결과(크기, 처리된 이미지 URL)를 기록합니다.
+    여러 워커가 같은 테이블을 처리해도 FOR UPDATE SKIP LOCKED로 같은 작업을 중복해서 가져가지 않습니다.
+    """
+    
+    CLAIM_SQL = """
+        UPDATE image_jobs
+        SET status = 'processing', attempts = attempts + 1, locked_at = now()
+        WHERE id IN (
+            SELECT id FROM image_jobs
+            WHERE (status = 'pending' AND run_after <= now())
+               OR (status = 'processing' AND locked_at < now() - make_interval(secs => %s))
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, image_url, attempts
+    """
+    
+    def __init__(self, workers, poll_interval):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.enqueued = 0
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+    
+    def start(self):
+        """디스패처 스레드 시작 (이미 시작했거나 처리 프로세스가 0이면 무시)"""
+        if self._thread is not None or self.workers <= 0:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='image-jobs', daemon=True)
+                self._thread.start()
+    
+    def enqueue(self, image_url):
+        """업로드된 이미지의 후처리 작업 등록 (실패해도 업로드는 성공으로 처리)"""
+        try:
+            conn = get_db_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "INSERT INTO image_jobs (image_url) VALUES (%s) ON CONFLICT (image_url) DO NOTHING",
+                        (image_url,)
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"이미지 후처리 작업 등록 오류: {e}")
+            return
+        self.enqueued += 1
+        self.start()
+        self._wakeup.set()
+    
+    def claim(self, limit):
+        """처리할 작업을 limit개까지 가져와 processing으로 표시"""
+        conn = connect_primary(connect_timeout=DB_CONNECT_TIMEOUT)
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(self.CLAIM_SQL, (IMAGE_JOB_LOCK_TIMEOUT, limit))
+                jobs = cur.fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+        return jobs
+    
+    def finish(self, job, result=None, error=None):
+        """처리 결과 기록. 실패하면 시도 횟수에 따라 나중에 다시 시도하거나 failed로 남김"""
+        conn = connect_primary(connect_timeout=DB_CONNECT_TIMEOUT)
+        try:
+            with conn.cursor() as cur:
+                if error is None:
+                    width, height, processed = result
+                    cur.execute("""
+                        UPDATE image_jobs
+                        SET status = 'done', width = %s, height = %s, processed_url = %s,
+                            error = NULL, locked_at = NULL, finished_at = now()
+                        WHERE id = %s
+                    """, (width, height, f"/images/{processed}" if processed else None, job['id']))
+                elif job['attempts'] >= IMAGE_JOB_MAX_ATTEMPTS:
+                    cur.execute("""
+                        UPDATE image_jobs
+                        SET status = 'failed', error = %s, locked_at = NULL, finished_at = now()
+                        WHERE id = %s
+                    """, (error, job['id']))
+                else:
+                    cur.execute("""
+                        UPDATE image_jobs
+                        SET status = 'pending', error = %s, locked_at = NULL,
+                            run_after = now() + make_interval(secs => %s)
+                        WHERE id = %s
+                    """, (error, IMAGE_JOB_RETRY_DELAY * 2 ** (job['attempts'] - 1), job['id']))
+                conn.commit()
+                
+                feeds = []
+                if error is None:
+                    # 커밋 후에 찾아야 그 사이 작성된 게시글도 빠지지 않음 (이후 작성분은 완료 상태를 읽음)
+                    cur.execute("SELECT DISTINCT meal_date, meal_type FROM posts WHERE image_url = %s",
+                                (job['image_url'],))
+                    feeds = cur.fetchall()
+                    conn.rollback()
+        finally:
+            conn.close()
+        
+        if error is None:
+            self.processed += 1
+            # 이 이미지를 쓰는 게시글이 있는 목록만 무효화
+            for meal_date, meal_type in feeds:
+                invalidate_feed(meal_date, meal_type)
+        elif job['attempts'] >= IMAGE_JOB_MAX_ATTEMPTS:
+            self.failed += 1
+            print(f"이미지 후처리 실패 ({job['image_url']}): {error}")
+        else:
+            self.retried += 1
+    
+    def _new_executor(self):
+        # 처리할 작업이 생겼을 때만 불러옴 (업로드가 없으면 시작 시간에 영향 없음)
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # fork 대신 spawn: 요청 처리 스레드가 잡고 있던 잠금/DB 연결을 자식 프로세스가 물려받지 않도록
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+    
+    def _run(self):
+        from concurrent.futures import as_completed
+        from concurrent.futures.process import BrokenProcessPool
+        
+        executor = None
+        while True:
+            self._wakeup.clear()
+            try:
+                jobs = self.claim(self.workers)
+            except Exception as e:
+                print(f"이미지 후처리 작업 조회 오류: {e}")
+                jobs = []
+            if not jobs:
+                self._wakeup.wait(self.poll_interval)
+                continue
+            
+            if executor is None:
+                executor = self._new_executor()
+            futures = {executor.submit(process_image_file, image_path(job['image_url'])): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                result, error = None, None
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                try:
+                    self.finish(job, result, error)
+                except Exception as e:
+                    print(f"이미지 후처리 결과 저장 오류: {e}")
+            
+            # 작업 프로세스가 비정상 종료되면 풀을 새로 만듦
+            if any(isinstance(future.exception(), BrokenProcessPool) for future in futures):
+                executor.shutdown(wait=False)
+                executor = self._new_executor()
+
+image_jobs = ImageJobQueue(IMAGE_WORKERS, IMAGE_JOB_POLL_INTERVAL)
+
+@app.before_request
+def start_image_jobs():
+    """재시작 전에 남은 작업도 처리하도록 첫 요청 때 디스패처 시작"""
+    image_jobs.start()
+
 # 이미지 업로드 API
 @app.route('/api/upload-image', methods=['POST'])
 def upload_image():
@@ -143,6 +1452,7 @@ def upload_image():
             file.save(filepath)
             
             image_url = f"/images/{unique_filename}"
+            image_jobs.enqueue(image_url)  # 방향 보정/크기 기록 등은 작업 프로세스에서 처리
             
             return jsonify({"image_url": image_url}), 201
         else:
@@ -170,6 +1480,7 @@ def serve_image(filename):
 
 # Base64 이미지 업로드 API
 @app.route('/api/upload-image-base64', methods=['POST'])
+@idempotent
 def upload_image_base64():
     try:
         data = request.get_json()
@@ -211,6 +1522,7 @@ def upload_image_base64():
         
         image_url = f"/images/{unique_filename}"
         print(f"생성된 이미지 URL: {image_url}")
+        image_jobs.enqueue(image_url)
         
         return jsonify({"image_url": image_url}), 201
         
@@ -218,45 +1530,194 @@ def upload_image_base64():
         print(f"이미지 업로드 오류: {e}")
         return jsonify({"error": str(e)}), 500
 
+# ===== 좋아요 여부 일괄 조회 =====
+
+MAX_LIKE_LOOKUP_IDS = 500  # 한 번에 조회할 수 있는 게시글/댓글 수
+
+# ids 중 user_identifier가 좋아요한 id 집합 (= ANY 한 번으로 조회)
+def liked_ids(cur, table, column, ids, user_identifier, meal_date=None):
+    if not ids:
+        return set()
+    query = f"SELECT {column} FROM {table} WHERE {column} = ANY(%s) AND user_identifier = %s"
+    params = [list(ids), user_identifier]
+    if meal_date is not None:
+        # 같은 날짜의 목록이면 해당 월 파티션만 조회
+        query += " AND meal_date = %s"
+        params.append(meal_date)
+    cur.execute(query, params)
+    return {row[column] for row in cur.fetchall()}
+
+# 목록의 각 항목에 liked_by_me 표시
+def mark_liked(cur, table, column, items, user_identifier, meal_date=None):
+    liked = liked_ids(cur, table, column, [item['id'] for item in items], user_identifier, meal_date)
+    for item in items:
+        item['liked_by_me'] = item['id'] in liked
+    return items
+
+# 쉼표로 구분된 id 목록 파라미터 (잘못된 값이면 ValueError)
+def parse_id_list(name):
+    value = request.args.get(name, '')
+    return [int(v) for v in value.split(',') if v.strip()]
+
+# 좋아요 여부 일괄 조회 API
+@app.route('/api/likes/status')
+def get_like_status():
+    """여러 게시글/댓글에 대한 좋아요 여부를 한 번에 조회 (?post_ids=1,2&comment_ids=3&user_identifier=...)"""
+    try:
+        user_identifier = request.args.get('user_identifier', request.remote_addr)
+        try:
+            post_ids = parse_id_list('post_ids')
+            comment_ids = parse_id_list('comment_ids')
+        except ValueError:
+            return jsonify({"error": "post_ids and comment_ids must be comma-separated integers"}), 400
+        
+        if len(post_ids) + len(comment_ids) > MAX_LIKE_LOOKUP_IDS:
+            return jsonify({"error": f"at most {MAX_LIKE_LOOKUP_IDS} ids can be requested"}), 400
+        
+        conn = get_db_connection(readonly=True)
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        liked_posts = liked_ids(cur, 'post_likes', 'post_id', post_ids, user_identifier)
+        liked_comments = liked_ids(cur, 'comment_likes', 'comment_id', comment_ids, user_identifier)
+        cur.close()
+        conn.close()
+        
+        return render_response({
+            "posts": {str(i): i in liked_posts for i in post_ids},
+            "comments": {str(i): i in liked_comments for i in comment_ids}
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# 자주 실행되는 게시글/좋아요 쿼리 (연결마다 한 번만 PREPARE)
+FEED_QUERY = prepared_statements.register('feed', """
+    SELECT p.*, 
+           COALESCE(c.comment_count, 0) as comment_count,
+           j.width as image_width, j.height as image_height, j.processed_url as processed_image_url
+    FROM posts p
+    LEFT JOIN (
+        SELECT post_id, COUNT(*) as comment_count 
+        FROM comments 
+        WHERE meal_date = %s  -- 해당 월 파티션만 조회
+        GROUP BY post_id
+    ) c ON p.id = c.post_id
+    LEFT JOIN image_jobs j ON j.image_url = p.image_url AND j.status = 'done'  -- 후처리 결과 (없으면 NULL)
+    WHERE p.meal_date = %s AND p.meal_type = %s
+    ORDER BY p.created_at DESC
+""")
+POST_BY_ID = prepared_statements.register('post_by_id', """
+    SELECT p.*, j.width as image_width, j.height as image_height, j.processed_url as processed_image_url
+    FROM posts p
+    LEFT JOIN image_jobs j ON j.image_url = p.image_url AND j.status = 'done'
+    WHERE p.id = %s
+""")
+# 좋아요 수는 이 게시글의 댓글마다 인덱스로 세어, 날짜 전체의 댓글 좋아요를 집계하지 않음
+POST_COMMENTS = prepared_statements.register('post_comments', """
+    SELECT c.*, cl.like_count as likes
+    FROM comments c
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) as like_count 
+        FROM comment_likes l
+        WHERE l.comment_id = c.id AND l.meal_date = %s  -- 해당 월 파티션만 조회
+    ) cl
+    WHERE c.post_id = %s AND c.meal_date = %s
+    ORDER BY c.created_at ASC
+""")
+POST_MEAL = prepared_statements.register('post_meal', "SELECT meal_date, meal_type FROM posts WHERE id = %s")
+POST_LIKE_FIND = prepared_statements.register('post_like_find', """
+    SELECT id FROM post_likes 
+    WHERE post_id = %s AND meal_date = %s AND user_identifier = %s
+""")
+POST_LIKE_DELETE = prepared_statements.register('post_like_delete', """
+    DELETE FROM post_likes 
+    WHERE post_id = %s AND meal_date = %s AND user_identifier = %s
+""")
+POST_LIKE_INSERT = prepared_statements.register('post_like_insert', """
+    INSERT INTO post_likes (post_id, meal_date, user_identifier)
+    VALUES (%s, %s, %s)
+""")
+POST_LIKES_ADD = prepared_statements.register('post_likes_add', """
+    UPDATE posts SET likes = likes + %s 
+    WHERE id = %s AND meal_date = %s
+    RETURNING likes
+""")
+COMMENT_MEAL = prepared_statements.register('comment_meal', "SELECT meal_date FROM comments WHERE id = %s")
+COMMENT_LIKE_FIND = prepared_statements.register('comment_like_find', """
+    SELECT id FROM comment_likes 
+    WHERE comment_id = %s AND meal_date = %s AND user_identifier = %s
+""")
+COMMENT_LIKE_DELETE = prepared_statements.register('comment_like_delete', """
+    DELETE FROM comment_likes 
+    WHERE comment_id = %s AND meal_date = %s AND user_identifier = %s
+""")
+COMMENT_LIKE_INSERT = prepared_statements.register('comment_like_insert', """
+    INSERT INTO comment_likes (comment_id, meal_date, user_identifier)
+    VALUES (%s, %s, %s)
+""")
+COMMENT_LIKE_COUNT = prepared_statements.register('comment_like_count', """
+    SELECT COUNT(*) as like_count 
+    FROM comment_likes 
+    WHERE comment_id = %s AND meal_date = %s
+""")
+
 @app.route('/api/posts', methods=['GET'])
 def get_posts():
     """특정 날짜와 식사 유형의 게시글 목록 조회"""
     try:
         meal_date = request.args.get('date')
         meal_type = request.args.get('meal_type')
+        user_identifier = request.args.get('user_identifier')  # 있으면 게시글마다 liked_by_me 포함
         
         if not meal_date or not meal_type:
             return jsonify({"error": "date and meal_type parameters are required"}), 400
         
-        conn = get_db_connection()
+        # 캐시 키와 무효화 키가 같은 형식이 되도록 날짜를 정규화 (2025-6-2와 2025-06-02를 같은 키로)
+        try:
+            meal_date = date.fromisoformat(meal_date)
+        except ValueError:
+            return jsonify({"error": "date must be YYYY-MM-DD"}), 400
+        
+        # 사용자별 좋아요 여부가 없는 목록은 직렬화된 응답 캐시에서 바로 응답
+        cache_key = feed_key(meal_date, meal_type) + (response_format(),)
+        if not user_identifier:
+            cached = feed_cache.get(cache_key)
+            if cached:
+                response = cached.to_response()
+                response.vary.add('Accept')
+                return response
+        
+        # 좋아요 여부가 필요한 요청도 사용자와 무관한 목록 행은 캐시를 쓰고, 좋아요 여부만 한 번의 쿼리로 추가
+        rows_key = feed_key(meal_date, meal_type) + ('rows',)
+        posts = feed_cache.get(rows_key) if user_identifier else None
+        started = time.monotonic()
+        
+        conn = get_db_connection(readonly=True)
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        query = """
-        SELECT p.*, 
-               COALESCE(c.comment_count, 0) as comment_count
-        FROM posts p
-        LEFT JOIN (
-            SELECT post_id, COUNT(*) as comment_count 
-            FROM comments 
-            GROUP BY post_id
-        ) c ON p.id = c.post_id
-        WHERE p.meal_date = %s AND p.meal_type = %s
-        ORDER BY p.created_at DESC
-        """
-        
-        cur.execute(query, (meal_date, meal_type))
-        posts = cur.fetchall()
+        fetched = posts is None
+        if fetched:
+            prepared_statements.execute(cur, FEED_QUERY, (meal_date, meal_date, meal_type))
+            posts = [dict(post) for post in cur.fetchall()]
+        if user_identifier:
+            items = mark_liked(cur, 'post_likes', 'post_id', [dict(post) for post in posts],
+                               user_identifier, meal_date)
         cur.close()
         conn.close()
         
-        # 시간 필드 변환
-        processed_posts = process_time_fields(list(posts))
+        if fetched:
+            feed_cache.set(rows_key, posts, started)
+        if user_identifier:
+            return render_response(items)
         
-        return jsonify(processed_posts)
+        cached = serialize_body(posts)
+        feed_cache.set(cache_key, cached, started)
+        response = cached.to_response()
+        response.vary.add('Accept')
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/posts', methods=['POST'])
+@idempotent
 def create_post():
     """새 게시글 작성"""
     try:
@@ -293,6 +1754,7 @@ def create_post():
         conn.commit()
         cur.close()
         conn.close()
+        invalidate_feed(new_post['meal_date'], new_post['meal_type'])
         
         # 시간 필드 변환
         processed_post = process_time_fields(dict(new_post))
@@ -305,38 +1767,32 @@ def create_post():
 def get_post_detail(post_id):
     """게시글 상세 조회"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(readonly=True)
         cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute('SELECT * FROM posts WHERE id = %s', (post_id,))
-        post = cur.fetchone()
-        
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        cur.execute("""
-            SELECT c.*, COALESCE(cl.like_count, 0) as likes
-            FROM comments c
-            LEFT JOIN (
-                SELECT comment_id, COUNT(*) as like_count 
-                FROM comment_likes 
-                GROUP BY comment_id
-            ) cl ON c.id = cl.comment_id
-            WHERE c.post_id = %s 
-            ORDER BY c.created_at ASC
-        """, (post_id,))
-        comments = cur.fetchall()
-        
-        cur.close()
-        conn.close()
+        try:
+            prepared_statements.execute(cur, POST_BY_ID, (post_id,))
+            post = cur.fetchone()
+            
+            if not post:
+                return jsonify({"error": "Post not found"}), 404
+            
+            prepared_statements.execute(cur, POST_COMMENTS, (post['meal_date'], post_id, post['meal_date']))
+            comments = cur.fetchall()
+            
+            # ?user_identifier= 가 있으면 게시글과 댓글의 좋아요 여부 포함
+            user_identifier = request.args.get('user_identifier')
+            if user_identifier:
+                mark_liked(cur, 'post_likes', 'post_id', [post], user_identifier, post['meal_date'])
+                mark_liked(cur, 'comment_likes', 'comment_id', comments, user_identifier, post['meal_date'])
+        finally:
+            # 404나 예외로 빠져나가도 연결을 풀로 돌려보냄
+            cur.close()
+            conn.close()
         
         result = dict(post)
         result['comments'] = list(comments)
         
-        # 시간 필드 변환
-        processed_result = process_time_fields(result)
-        
-        return jsonify(processed_result)
+        return render_response(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -349,45 +1805,36 @@ def toggle_post_like(post_id):
         
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT id FROM post_likes 
-            WHERE post_id = %s AND user_identifier = %s
-        """, (post_id, user_identifier))
-        
-        existing_like = cur.fetchone()
-        
-        if existing_like:
-            cur.execute("""
-                DELETE FROM post_likes 
-                WHERE post_id = %s AND user_identifier = %s
-            """, (post_id, user_identifier))
+        try:
+            # 좋아요는 게시글과 같은 meal_date 파티션에 저장
+            prepared_statements.execute(cur, POST_MEAL, (post_id,))
+            post = cur.fetchone()
+            if not post:
+                return jsonify({"error": "Post not found"}), 404
+            meal_date = post['meal_date']
             
-            cur.execute("""
-                UPDATE posts SET likes = likes - 1 
-                WHERE id = %s
-            """, (post_id,))
+            prepared_statements.execute(cur, POST_LIKE_FIND, (post_id, meal_date, user_identifier))
             
-            liked = False
-        else:
-            cur.execute("""
-                INSERT INTO post_likes (post_id, user_identifier)
-                VALUES (%s, %s)
-            """, (post_id, user_identifier))
+            existing_like = cur.fetchone()
             
-            cur.execute("""
-                UPDATE posts SET likes = likes + 1 
-                WHERE id = %s
-            """, (post_id,))
+            if existing_like:
+                prepared_statements.execute(cur, POST_LIKE_DELETE, (post_id, meal_date, user_identifier))
+                prepared_statements.execute(cur, POST_LIKES_ADD, (-1, post_id, meal_date))
+                liked = False
+            else:
+                prepared_statements.execute(cur, POST_LIKE_INSERT, (post_id, meal_date, user_identifier))
+                prepared_statements.execute(cur, POST_LIKES_ADD, (1, post_id, meal_date))
+                liked = True
             
-            liked = True
-        
-        cur.execute('SELECT likes FROM posts WHERE id = %s', (post_id,))
-        result = cur.fetchone()
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+            # 변경된 좋아요 수 (UPDATE ... RETURNING)
+            result = cur.fetchone()
+            
+            conn.commit()
+        finally:
+            # 404나 예외로 빠져나가도 연결을 풀로 돌려보냄 (커밋 전이면 풀이 롤백)
+            cur.close()
+            conn.close()
+        invalidate_feed(meal_date, post['meal_type'])
         
         return jsonify({
             "liked": liked,
@@ -397,6 +1844,7 @@ def toggle_post_like(post_id):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/posts/<int:post_id>/comments', methods=['POST'])
+@idempotent
 def create_comment(post_id):
     """댓글 작성"""
     try:
@@ -411,21 +1859,37 @@ def create_comment(post_id):
         # 한국 시간으로 created_at 설정
         kst_now = datetime.now(KST)
         
+        # 댓글은 게시글의 meal_date를 함께 저장하여 같은 월 파티션에 들어감
         query = """
-        INSERT INTO comments (post_id, content, author, created_at)
-        VALUES (%s, %s, %s, %s)
-        RETURNING *, 0 as likes
+        WITH post AS (
+            SELECT id, meal_date, meal_type FROM posts WHERE id = %s
+        ), inserted AS (
+            INSERT INTO comments (post_id, meal_date, content, author, created_at)
+            SELECT id, meal_date, %s, %s, %s FROM post
+            RETURNING *
+        )
+        SELECT inserted.*, 0 as likes, post.meal_type as post_meal_type
+        FROM inserted, post
         """
         
-        cur.execute(query, (post_id, data['content'], data['author'], kst_now))
-        new_comment = cur.fetchone()
+        try:
+            cur.execute(query, (post_id, data['content'], data['author'], kst_now))
+            new_comment = cur.fetchone()
+            
+            if not new_comment:
+                return jsonify({"error": "Post not found"}), 404
+            
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
         
-        conn.commit()
-        cur.close()
-        conn.close()
+        # 목록의 댓글 수가 바뀌므로 캐시 무효화
+        new_comment = dict(new_comment)
+        invalidate_feed(new_comment['meal_date'], new_comment.pop('post_meal_type'))
         
         # 시간 필드 변환
-        processed_comment = process_time_fields(dict(new_comment))
+        processed_comment = process_time_fields(new_comment)
         
         return jsonify(processed_comment), 201
     except Exception as e:
@@ -440,37 +1904,31 @@ def toggle_comment_like(comment_id):
         
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cur.execute("""
-            SELECT id FROM comment_likes 
-            WHERE comment_id = %s AND user_identifier = %s
-        """, (comment_id, user_identifier))
-        
-        existing_like = cur.fetchone()
-        
-        if existing_like:
-            cur.execute("""
-                DELETE FROM comment_likes 
-                WHERE comment_id = %s AND user_identifier = %s
-            """, (comment_id, user_identifier))
-            liked = False
-        else:
-            cur.execute("""
-                INSERT INTO comment_likes (comment_id, user_identifier)
-                VALUES (%s, %s)
-            """, (comment_id, user_identifier))
-            liked = True
-        
-        cur.execute("""
-            SELECT COUNT(*) as like_count 
-            FROM comment_likes 
-            WHERE comment_id = %s
-        """, (comment_id,))
-        result = cur.fetchone()
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        try:
+            prepared_statements.execute(cur, COMMENT_MEAL, (comment_id,))
+            comment = cur.fetchone()
+            if not comment:
+                return jsonify({"error": "Comment not found"}), 404
+            meal_date = comment['meal_date']
+            
+            prepared_statements.execute(cur, COMMENT_LIKE_FIND, (comment_id, meal_date, user_identifier))
+            
+            existing_like = cur.fetchone()
+            
+            if existing_like:
+                prepared_statements.execute(cur, COMMENT_LIKE_DELETE, (comment_id, meal_date, user_identifier))
+                liked = False
+            else:
+                prepared_statements.execute(cur, COMMENT_LIKE_INSERT, (comment_id, meal_date, user_identifier))
+                liked = True
+            
+            prepared_statements.execute(cur, COMMENT_LIKE_COUNT, (comment_id, meal_date))
+            result = cur.fetchone()
+            
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
         
         return jsonify({
             "liked": liked,
@@ -514,26 +1972,27 @@ def register():
         
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 중복 확인
-        cur.execute("SELECT id FROM users WHERE username = %s OR email = %s", (username, email))
-        if cur.fetchone():
-            return jsonify({"error": "Username or email already exists"}), 409
-        
-        # 사용자 생성
-        hashed_password = hash_password(password)
-        kst_now = datetime.now(KST)
-        
-        cur.execute("""
-            INSERT INTO users (username, password, email, created_at)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id, username, email, created_at
-        """, (username, hashed_password, email, kst_now))
-        
-        new_user = cur.fetchone()
-        conn.commit()
-        cur.close()
-        conn.close()
+        try:
+            # 중복 확인
+            cur.execute("SELECT id FROM users WHERE username = %s OR email = %s", (username, email))
+            if cur.fetchone():
+                return jsonify({"error": "Username or email already exists"}), 409
+            
+            # 사용자 생성
+            hashed_password = hash_password(password)
+            kst_now = datetime.now(KST)
+            
+            cur.execute("""
+                INSERT INTO users (username, password, email, created_at)
+                VALUES (%s, %s, %s, %s)
+                RETURNING id, username, email, created_at
+            """, (username, hashed_password, email, kst_now))
+            
+            new_user = cur.fetchone()
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
         
         return jsonify({
             "message": "User registered successfully",
@@ -558,26 +2017,27 @@ def login():
         
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 사용자 조회
-        cur.execute("SELECT id, username, password, email FROM users WHERE username = %s", (username,))
-        user = cur.fetchone()
-        
-        if not user or not verify_password(password, user['password']):
-            return jsonify({"error": "Invalid username or password"}), 401
-        
-        # 세션 토큰 생성 및 저장
-        session_token = generate_session_token()
-        expires_at = datetime.now(KST) + timedelta(days=7)  # 7일 후 만료
-        
-        cur.execute("""
-            INSERT INTO user_sessions (user_id, session_token, expires_at, created_at)
-            VALUES (%s, %s, %s, %s)
-        """, (user['id'], session_token, expires_at, datetime.now(KST)))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        try:
+            # 사용자 조회
+            cur.execute("SELECT id, username, password, email FROM users WHERE username = %s", (username,))
+            user = cur.fetchone()
+            
+            if not user or not verify_password(password, user['password']):
+                return jsonify({"error": "Invalid username or password"}), 401
+            
+            # 세션 토큰 생성 및 저장
+            session_token = generate_session_token()
+            expires_at = datetime.now(KST) + timedelta(days=7)  # 7일 후 만료
+            
+            cur.execute("""
+                INSERT INTO user_sessions (user_id, session_token, expires_at, created_at)
+                VALUES (%s, %s, %s, %s)
+            """, (user['id'], session_token, expires_at, datetime.now(KST)))
+            
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
         
         return jsonify({
             "message": "Login successful",
@@ -619,18 +2079,20 @@ def logout():
         return jsonify({"error": str(e)}), 500
 
 # 세션 검증 함수
+VERIFY_SESSION = prepared_statements.register('verify_session', """
+    SELECT u.id, u.username, u.email 
+    FROM users u
+    JOIN user_sessions s ON u.id = s.user_id
+    WHERE s.session_token = %s AND s.expires_at > %s
+""")
+
 def verify_session(session_token):
     """세션 토큰 검증"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(readonly=True)
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        cur.execute("""
-            SELECT u.id, u.username, u.email 
-            FROM users u
-            JOIN user_sessions s ON u.id = s.user_id
-            WHERE s.session_token = %s AND s.expires_at > %s
-        """, (session_token, datetime.now(KST)))
+        prepared_statements.execute(cur, VERIFY_SESSION, (session_token, datetime.now(KST)))
         
         user = cur.fetchone()
         cur.close()
@@ -642,6 +2104,14 @@ def verify_session(session_token):
         print(f"Session verification error: {e}")
         return None
 
+# GET 요청용 세션 토큰
+def get_request_session_token():
+    """Authorization: Bearer 헤더 또는 session_token 쿼리 파라미터에서 세션 토큰 추출"""
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Bearer '):
+        return auth[len('Bearer '):].strip()
+    return request.args.get('session_token')
+
 # ===== 게시글 수정/삭제 API =====
 
 # 게시글 수정 API
@@ -660,19 +2130,6 @@ def update_post(post_id):
         if not user:
             return jsonify({"error": "Invalid or expired session"}), 401
         
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # 게시글 존재 및 작성자 확인
-        cur.execute("SELECT author FROM posts WHERE id = %s", (post_id,))
-        post = cur.fetchone()
-        
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        if post['author'] != user['username']:
-            return jsonify({"error": "You can only edit your own posts"}), 403
-        
         # 수정할 필드들
         title = data.get('title')
         content = data.get('content')
@@ -699,15 +2156,30 @@ def update_post(post_id):
         # 수정 시간 추가
         update_fields.append("updated_at = %s")
         update_values.append(datetime.now(KST))
-        update_values.append(post_id)
+        update_values.extend([post_id, user['username']])
         
-        query = f"UPDATE posts SET {', '.join(update_fields)} WHERE id = %s RETURNING *"
+        conn = get_db_connection()
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        
+        # 작성자 조건을 함께 걸어 한 번에 수정 (수정된 행이 없을 때만 원인 확인)
+        query = f"UPDATE posts SET {', '.join(update_fields)} WHERE id = %s AND author = %s RETURNING *"
         cur.execute(query, update_values)
         
         updated_post = cur.fetchone()
+        if not updated_post:
+            cur.execute("SELECT 1 FROM posts WHERE id = %s", (post_id,))
+            exists = cur.fetchone()
+            conn.rollback()
+            cur.close()
+            conn.close()
+            if not exists:
+                return jsonify({"error": "Post not found"}), 404
+            return jsonify({"error": "You can only edit your own posts"}), 403
+        
         conn.commit()
         cur.close()
         conn.close()
+        invalidate_feed(updated_post['meal_date'], updated_post['meal_type'])
         
         return jsonify({
             "message": "Post updated successfully",
@@ -736,25 +2208,23 @@ def delete_post(post_id):
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        # 게시글 존재 및 작성자 확인
-        cur.execute("SELECT author FROM posts WHERE id = %s", (post_id,))
-        post = cur.fetchone()
-        
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        if post['author'] != user['username']:
+        # 작성자 조건을 함께 걸어 한 번에 삭제 (댓글/좋아요는 외래 키 ON DELETE CASCADE로 함께 삭제)
+        cur.execute("DELETE FROM posts WHERE id = %s AND author = %s RETURNING meal_date, meal_type", (post_id, user['username']))
+        
+        deleted = cur.fetchone()
+        if not deleted:
+            cur.execute("SELECT 1 FROM posts WHERE id = %s", (post_id,))
+            exists = cur.fetchone()
+            cur.close()
+            conn.close()
+            if not exists:
+                return jsonify({"error": "Post not found"}), 404
             return jsonify({"error": "You can only delete your own posts"}), 403
         
-        # 관련 데이터 삭제 (외래 키 제약으로 인해)
-        cur.execute("DELETE FROM comment_likes WHERE comment_id IN (SELECT id FROM comments WHERE post_id = %s)", (post_id,))
-        cur.execute("DELETE FROM comments WHERE post_id = %s", (post_id,))
-        cur.execute("DELETE FROM post_likes WHERE post_id = %s", (post_id,))
-        cur.execute("DELETE FROM posts WHERE id = %s", (post_id,))
-        
         conn.commit()
         cur.close()
         conn.close()
+        invalidate_feed(deleted['meal_date'], deleted['meal_type'])
         
         return jsonify({"message": "Post deleted successfully"}), 200
         
@@ -786,25 +2256,25 @@ def update_comment(comment_id):
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        # 댓글 존재 및 작성자 확인
-        cur.execute("SELECT author FROM comments WHERE id = %s", (comment_id,))
-        comment = cur.fetchone()
-        
-        if not comment:
-            return jsonify({"error": "Comment not found"}), 404
-        
-        if comment['author'] != user['username']:
-            return jsonify({"error": "You can only edit your own comments"}), 403
-        
-        # 댓글 수정
+        # 작성자 조건을 함께 걸어 한 번에 수정
         cur.execute("""
             UPDATE comments 
             SET content = %s, updated_at = %s 
-            WHERE id = %s 
+            WHERE id = %s AND author = %s
             RETURNING *
-        """, (content, datetime.now(KST), comment_id))
+        """, (content, datetime.now(KST), comment_id, user['username']))
         
         updated_comment = cur.fetchone()
+        if not updated_comment:
+            cur.execute("SELECT 1 FROM comments WHERE id = %s", (comment_id,))
+            exists = cur.fetchone()
+            conn.rollback()
+            cur.close()
+            conn.close()
+            if not exists:
+                return jsonify({"error": "Comment not found"}), 404
+            return jsonify({"error": "You can only edit your own comments"}), 403
+        
         conn.commit()
         cur.close()
         conn.close()
@@ -836,29 +2306,288 @@ def delete_comment(comment_id):
         conn = get_db_connection()
         cur = conn.cursor(cursor_factory=RealDictCursor)
         
-        # 댓글 존재 및 작성자 확인
-        cur.execute("SELECT author FROM comments WHERE id = %s", (comment_id,))
-        comment = cur.fetchone()
-        
-        if not comment:
-            return jsonify({"error": "Comment not found"}), 404
-        
-        if comment['author'] != user['username']:
+        # 작성자 조건을 함께 걸어 한 번에 삭제 (좋아요는 외래 키 ON DELETE CASCADE로 함께 삭제)
+        cur.execute("""
+            DELETE FROM comments c
+            USING posts p
+            WHERE c.id = %s AND c.author = %s AND p.id = c.post_id AND p.meal_date = c.meal_date
+            RETURNING c.meal_date, p.meal_type
+        """, (comment_id, user['username']))
+        
+        deleted = cur.fetchone()
+        if not deleted:
+            cur.execute("SELECT 1 FROM comments WHERE id = %s", (comment_id,))
+            exists = cur.fetchone()
+            cur.close()
+            conn.close()
+            if not exists:
+                return jsonify({"error": "Comment not found"}), 404
             return jsonify({"error": "You can only delete your own comments"}), 403
         
-        # 관련 좋아요 삭제 후 댓글 삭제
-        cur.execute("DELETE FROM comment_likes WHERE comment_id = %s", (comment_id,))
-        cur.execute("DELETE FROM comments WHERE id = %s", (comment_id,))
-        
         conn.commit()
         cur.close()
         conn.close()
+        invalidate_feed(deleted['meal_date'], deleted['meal_type'])
         
         return jsonify({"message": "Comment deleted successfully"}), 200
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+# ===== 내 활동 API =====
+
+MY_ACTIVITY_PAGE_SIZE = 20  # 기본 페이지 크기
+MY_ACTIVITY_MAX_PAGE_SIZE = 100
+
+# 작성자 기준 목록 조회 ((author, created_at, id) 인덱스를 최신순으로 읽으며 before 커서 이후부터)
+# query의 {cursor} 자리에 커서 조건이 들어감
+def list_my_rows(query, alias, username):
+    try:
+        limit = min(int(request.args.get('limit', MY_ACTIVITY_PAGE_SIZE)), MY_ACTIVITY_MAX_PAGE_SIZE)
+        before_id = request.args.get('before_id')
+        before_id = int(before_id) if before_id else None
+    except ValueError:
+        return jsonify({"error": "limit and before_id must be integers"}), 400
+    before = request.args.get('before')  # 이전 페이지 next_cursor의 created_at
+    if bool(before) != (before_id is not None):
+        return jsonify({"error": "before and before_id must be given together"}), 400
+    
+    cursor = f"AND ({alias}.created_at, {alias}.id) < (%(before)s::timestamp, %(before_id)s)" if before else ""
+    
+    conn = get_db_connection(readonly=True)
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cur.execute(query.format(cursor=cursor), {
+        'author': username,
+        'before': before,
+        'before_id': before_id,
+        'limit': limit + 1  # 다음 페이지 존재 여부 확인용
+    })
+    rows = cur.fetchall()
+    cur.close()
+    conn.close()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = {"before": last['created_at'].isoformat(), "before_id": last['id']}
+    
+    return render_response({"items": list(rows), "next_cursor": next_cursor})
+
+# 내가 쓴 게시글 API
+@app.route('/api/me/posts')
+def get_my_posts():
+    """로그인한 사용자의 게시글 목록 (최신순, ?limit=&before=&before_id=)"""
+    try:
+        session_token = get_request_session_token()
+        if not session_token:
+            return jsonify({"error": "Session token is required"}), 401
+        
+        user = verify_session(session_token)
+        if not user:
+            return jsonify({"error": "Invalid or expired session"}), 401
+        
+        return list_my_rows("""
+            SELECT p.*,
+                   (SELECT COUNT(*) FROM comments c
+                    WHERE c.post_id = p.id AND c.meal_date = p.meal_date) as comment_count
+            FROM posts p
+            WHERE p.author = %(author)s
+            {cursor}
+            ORDER BY p.created_at DESC, p.id DESC
+            LIMIT %(limit)s
+        """, 'p', user['username'])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# 내가 쓴 댓글 API
+@app.route('/api/me/comments')
+def get_my_comments():
+    """로그인한 사용자의 댓글 목록과 댓글이 달린 게시글 제목 (최신순, ?limit=&before=&before_id=)"""
+    try:
+        session_token = get_request_session_token()
+        if not session_token:
+            return jsonify({"error": "Session token is required"}), 401
+        
+        user = verify_session(session_token)
+        if not user:
+            return jsonify({"error": "Invalid or expired session"}), 401
+        
+        return list_my_rows("""
+            SELECT c.*, p.title as post_title, p.meal_type
+            FROM comments c
+            JOIN posts p ON p.id = c.post_id AND p.meal_date = c.meal_date
+            WHERE c.author = %(author)s
+            {cursor}
+            ORDER BY c.created_at DESC, c.id DESC
+            LIMIT %(limit)s
+        """, 'c', user['username'])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ===== 달력 통계 API =====
+
+# 월별 날짜/식사별 게시글·댓글·좋아요 수 API
+@app.route('/api/stats/calendar')
+def get_calendar_stats():
+    """한 달 동안의 날짜/식사별 활동량 (?month=YYYY-MM, 기본값: 이번 달, daily_meal_stats 요약 테이블 사용)"""
+    try:
+        month = request.args.get('month') or datetime.now(KST).strftime('%Y-%m')
+        try:
+            month_start = datetime.strptime(month, '%Y-%m').date()
+        except ValueError:
+            return jsonify({"error": "month must be in YYYY-MM format"}), 400
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        
+        conn = get_db_connection(readonly=True)
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT meal_date, meal_type, posts, comments, likes
+            FROM daily_meal_stats
+            WHERE meal_date >= %s AND meal_date < %s
+            ORDER BY meal_date, meal_type
+        """, (month_start, next_month))
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        
+        # 날짜별로 묶어서 {식사: 수치} 형태로 반환
+        days = {}
+        for row in rows:
+            day = days.setdefault(row['meal_date'].isoformat(), {"date": row['meal_date'].isoformat(), "meals": {}})
+            day['meals'][row['meal_type']] = {
+                "posts": row['posts'],
+                "comments": row['comments'],
+                "likes": row['likes']
+            }
+        
+        return render_response({"month": month_start.strftime('%Y-%m'), "days": list(days.values())})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# ===== 데이터 내보내기 API =====
+
+# 내보내기 설정
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))  # 서버 측 커서에서 한 번에 가져올 행 수
+EXPORT_USERS = {u for u in os.environ.get('EXPORT_USERS', '').split(',') if u}  # 비어 있으면 로그인한 모든 사용자 허용
+
+# 내보낼 수 있는 테이블: (테이블, 컬럼 목록, 기간 필터 컬럼)
+EXPORT_TABLES = {
+    'posts': ('posts', ['id', 'title', 'content', 'author', 'meal_date', 'meal_type',
+                        'image_url', 'likes', 'created_at', 'updated_at'], 'created_at'),
+    'comments': ('comments', ['id', 'post_id', 'meal_date', 'content', 'author', 'created_at', 'updated_at'], 'created_at'),
+    'menus': ('meal_menu', ['id', 'school', 'date', 'meal_type', 'content'], 'date'),
+}
+
+def export_value(value):
+    """내보내기용 값 변환 (시간은 한국 시간 ISO 8601 문자열)"""
+    if isinstance(value, datetime):
+        return convert_to_kst_string(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+def stream_export_rows(table, columns, filters, params, fmt):
+    """서버 측 커서로 EXPORT_BATCH_SIZE 행씩 읽어 NDJSON/CSV 청크를 생성"""
+    conn = get_db_connection(readonly=True)
+    try:
+        cur = conn.cursor(name=f'export_{table}')
+        cur.itersize = EXPORT_BATCH_SIZE
+        where = f"WHERE {' AND '.join(filters)}" if filters else ''
+        cur.execute(f"SELECT {', '.join(columns)} FROM {table} {where} ORDER BY id", params)
+        
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+        
+        while True:
+            rows = cur.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            
+            if fmt == 'csv':
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([export_value(v) for v in row] for row in rows)
+                yield buffer.getvalue()
+            else:
+                yield ''.join(
+                    json.dumps(dict(zip(columns, map(export_value, row))), ensure_ascii=False) + '\n'
+                    for row in rows
+                )
+        
+        cur.close()
+    except Exception as e:
+        # 헤더는 이미 전송되었으므로 다시 발생시켜 청크 응답을 끝맺지 않고 끊음
+        # (정상 종료처럼 보이면 증분 내보내기 사용자가 잘린 것을 알 수 없음)
+        print(f"내보내기 오류 ({table}): {e}")
+        raise
+    finally:
+        conn.close()
+
+# 데이터 내보내기 API
+@app.route('/api/export/<name>')
+def export_data(name):
+    """게시글/댓글/메뉴를 NDJSON 또는 CSV로 스트리밍 (from, to, after_id로 증분 내보내기)"""
+    try:
+        if name not in EXPORT_TABLES:
+            return jsonify({"error": f"Unknown export: {name}"}), 404
+        
+        session_token = get_request_session_token()
+        if not session_token:
+            return jsonify({"error": "Session token is required"}), 401
+        
+        user = verify_session(session_token)
+        if not user:
+            return jsonify({"error": "Invalid or expired session"}), 401
+        
+        if EXPORT_USERS and user['username'] not in EXPORT_USERS:
+            return jsonify({"error": "Export is not allowed for this user"}), 403
+        
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in ('ndjson', 'csv'):
+            return jsonify({"error": "format must be ndjson or csv"}), 400
+        
+        # 스트리밍이 시작되면 200 헤더가 이미 나가므로 쿼리 전에 날짜 형식 확인
+        bounds = {}
+        for arg in ('from', 'to'):
+            if request.args.get(arg):
+                try:
+                    bounds[arg] = date.fromisoformat(request.args[arg])
+                except ValueError:
+                    return jsonify({"error": f"{arg} must be YYYY-MM-DD"}), 400
+        
+        table, columns, date_column = EXPORT_TABLES[name]
+        filters, params = [], []
+        
+        if 'from' in bounds:
+            filters.append(f"{date_column} >= %s")
+            params.append(bounds['from'])
+        if 'to' in bounds:
+            # to 날짜 당일까지 포함
+            filters.append(f"{date_column} < %s::date + 1")
+            params.append(bounds['to'])
+        after_id = request.args.get('after_id', type=int)
+        if after_id is not None:
+            filters.append("id > %s")
+            params.append(after_id)
+        
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        response = Response(
+            stream_with_context(stream_export_rows(table, columns, filters, params, fmt)),
+            mimetype=f"{mimetype}; charset=utf-8"
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename="{name}.{fmt}"'
+        return response
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
         
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # 디버그 모드(코드 변경 시 재시작)는 개발할 때만 FLASK_DEBUG=1 로 켬. 재시작 감시 프로세스 때문에 시작이 느려짐
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=os.environ.get('FLASK_DEBUG') == '1')
\ No newline at end of file
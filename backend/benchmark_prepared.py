@@ -0,0 +1,85 @@
+# backend/benchmark_prepared.py - 자주 쓰는 쿼리의 일반 실행 / PREPARE 후 EXECUTE 시간 비교
+#
+# 사용법: DATABASE_URL=postgresql://... python benchmark_prepared.py [반복 횟수]
+# 게시글이 하나 이상 있는 DB에서 실행하세요. 같은 연결에서 쿼리별로
+#   - 평균 실행 시간 (일반 실행 / EXECUTE)
+#   - EXPLAIN ANALYZE의 Planning Time (일반 실행 / EXECUTE)
+# 을 출력합니다. (EXECUTE는 여섯 번째 실행부터 일반 계획을 재사용하면 계획 시간이 거의 0이 됩니다)
+# meal_date 조건으로 파티션을 고르는 쿼리는 Postgres가 매번 맞춤 계획을 세우므로 파싱 시간만 줄고,
+# 파티션 키 없이 id로 찾는 쿼리(post_by_id 등)는 계획 시간이 가장 많이 줄어듭니다.
+import re
+import sys
+import time
+
+from psycopg2.extras import RealDictCursor
+
+from app import (FEED_QUERY, POST_BY_ID, POST_COMMENTS, POST_LIKE_FIND, VERIFY_SESSION,
+                 datetime, KST, connect_primary, prepared_statements)
+
+
+def sample_params(cur):
+    """벤치마크에 쓸 실제 게시글/세션 값"""
+    cur.execute("SELECT id, meal_date, meal_type FROM posts ORDER BY id DESC LIMIT 1")
+    post = cur.fetchone()
+    if not post:
+        print("게시글이 없습니다. 게시글을 하나 이상 작성한 뒤 실행하세요.")
+        sys.exit(1)
+    cur.execute("SELECT session_token FROM user_sessions ORDER BY id DESC LIMIT 1")
+    session = cur.fetchone()
+    token = session['session_token'] if session else 'missing-token'
+    return {
+        FEED_QUERY: (post['meal_date'], post['meal_date'], post['meal_type']),
+        POST_BY_ID: (post['id'],),
+        POST_COMMENTS: (post['meal_date'], post['id'], post['meal_date']),
+        POST_LIKE_FIND: (post['id'], post['meal_date'], 'benchmark'),
+        VERIFY_SESSION: (token, datetime.now(KST)),
+    }
+
+
+def plain_sql(name):
+    """등록된 $n 형식 SQL을 %s 형식으로 되돌림 (일반 실행용)"""
+    sql, _ = prepared_statements._statements[name]
+    return re.sub(r'\$\d+', '%s', sql)
+
+
+def planning_ms(cur, sql, params):
+    cur.execute("EXPLAIN (ANALYZE, SUMMARY) " + sql, params)
+    for row in cur.fetchall():
+        line = list(row.values())[0]
+        if line.startswith('Planning Time'):
+            return float(line.split(':')[1].split()[0])
+    return 0.0
+
+
+def measure(cur, run, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        run()
+        cur.fetchall()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    conn = connect_primary()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    cases = sample_params(cur)
+
+    print(f"{'statement':<16} {'plain ms':>9} {'prepared ms':>12} {'plan ms':>8} {'exec plan ms':>13}")
+    for name, params in cases.items():
+        sql = plain_sql(name)
+        plain = measure(cur, lambda: cur.execute(sql, params), iterations)
+        prepared = measure(cur, lambda: prepared_statements.execute(cur, name, params), iterations)
+        placeholders = ', '.join(['%s'] * len(params))
+        print(f"{name:<16} {plain:9.3f} {prepared:12.3f} "
+              f"{planning_ms(cur, sql, params):8.3f} "
+              f"{planning_ms(cur, f'EXECUTE {name} ({placeholders})', params):13.3f}")
+        conn.rollback()
+
+    cur.close()
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# backend/benchmark_serialization.py - JSON(jsonify) / MessagePack 응답 크기와 직렬화 시간 비교
+#
+# 사용법: python benchmark_serialization.py [게시글 수] [반복 횟수]
+# DB 없이 get_posts / get_post_detail 과 같은 구조의 데이터를 만들어 측정합니다.
+import gzip
+import sys
+import time
+from datetime import datetime, timedelta, date
+
+from app import app, serialize_body
+
+
+def sample_posts(count):
+    """get_posts 응답과 같은 구조의 게시글 목록"""
+    base = datetime(2025, 6, 2, 3, 0, 0)
+    return [{
+        'id': i,
+        'title': f'오늘 점심 제육볶음 후기 {i}',
+        'content': '제육볶음이 맵지 않고 양도 넉넉했어요. 된장찌개는 조금 짰지만 전체적으로 만족합니다. ' * 3,
+        'author': f'학생{i % 50}',
+        'meal_date': date(2025, 6, 2),
+        'meal_type': '점심',
+        'image_url': f'/images/{i:032x}.jpg' if i % 3 == 0 else None,
+        'likes': i % 17,
+        'created_at': base + timedelta(minutes=i),
+        'updated_at': None,
+        'comment_count': i % 5,
+    } for i in range(count)]
+
+
+def sample_detail(comment_count):
+    """get_post_detail 응답과 같은 구조의 게시글 + 댓글"""
+    post = sample_posts(1)[0]
+    post['comments'] = [{
+        'id': i,
+        'post_id': 0,
+        'content': '저도 오늘 먹었는데 맛있었어요!',
+        'author': f'학생{i}',
+        'created_at': datetime(2025, 6, 2, 4, 0, 0) + timedelta(seconds=i),
+        'updated_at': None,
+        'likes': i % 3,
+    } for i in range(comment_count)]
+    return post
+
+
+def measure(data, accept, iterations):
+    with app.test_request_context(headers={'Accept': accept}):
+        body = serialize_body(data).body
+        start = time.perf_counter()
+        for _ in range(iterations):
+            serialize_body(data)
+        elapsed = (time.perf_counter() - start) / iterations * 1000
+    return body, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    cases = [
+        (f'get_posts ({count}건)', sample_posts(count)),
+        (f'get_post_detail (댓글 {count}건)', sample_detail(count)),
+    ]
+    for name, data in cases:
+        print(name)
+        for label, accept in (('json', 'application/json'), ('msgpack', 'application/msgpack')):
+            body, ms = measure(data, accept, iterations)
+            print(f"  {label:<8} {len(body):>9} bytes  gzip {len(gzip.compress(body)):>8} bytes  {ms:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# backend/benchmark_startup.py - 백엔드 시작 시간(첫 요청 응답까지) 측정과 모듈 불러오기 시간 분석
+#
+# 사용법: DATABASE_URL=postgresql://... python benchmark_startup.py [반복 횟수] [예산(초)]
+#   1. python -X importtime 으로 app 모듈을 불러올 때 패키지별로 걸리는 시간 상위 목록을 출력
+#   2. 컨테이너와 같은 방식(python app.py)으로 서버를 띄워 /api/health 첫 응답까지 걸린 시간을 반복 측정
+# 측정값의 중앙값이 예산(기본 STARTUP_BUDGET 환경변수 또는 3초)을 넘으면 종료 코드 1을 반환합니다.
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_BUDGET = float(os.environ.get('STARTUP_BUDGET', 3.0))
+STARTUP_TIMEOUT = 30  # 이 시간 안에 응답이 없으면 실패로 처리(초)
+
+
+def import_profile(module, top=10):
+    """모듈을 새 프로세스에서 불러오며 최상위 패키지별 누적 시간(ms) 상위 목록을 반환"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=BACKEND_DIR, capture_output=True, text=True)
+    # importtime은 하위 모듈을 먼저 출력하므로, module 줄 바로 앞의 한 단계 들여쓴 항목이 module이 직접 불러온 모듈
+    totals = {}
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == module:
+                for child, ms in children:
+                    package = child.split('.')[0]
+                    totals[package] = totals.get(package, 0) + ms
+            children = []
+        elif depth == 1:
+            children.append((name.strip(), int(cumulative) / 1000))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request():
+    """python app.py 실행부터 /api/health 첫 응답까지 걸린 시간(초)"""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port))
+    started = time.perf_counter()
+    # FLASK_DEBUG=1 로 측정할 때 생기는 재시작 감시 프로세스와 자식 서버를 함께 종료하도록 새 프로세스 그룹으로 실행
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        while time.perf_counter() - started < STARTUP_TIMEOUT:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버가 종료되었습니다 (코드 {process.returncode})")
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1) as response:
+                    response.read()
+                return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"{STARTUP_TIMEOUT}초 안에 응답이 없습니다")
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else STARTUP_BUDGET
+
+    print("app 모듈 불러오기 (패키지별 누적 ms)")
+    for package, ms in import_profile('app'):
+        print(f"  {package:<24} {ms:8.1f}")
+
+    timings = [time_to_first_request() for _ in range(iterations)]
+    median = statistics.median(timings)
+    print(f"첫 요청 응답까지: 중앙값 {median:.3f}s, 최소 {min(timings):.3f}s, 최대 {max(timings):.3f}s "
+          f"({iterations}회, 예산 {budget:.1f}s)")
+    if median > budget:
+        print("FAIL 시작 시간이 예산을 넘었습니다")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
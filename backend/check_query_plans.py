@@ -0,0 +1,85 @@
+# backend/check_query_plans.py - 게시글 상세 쿼리 실행 계획 회귀 확인
+#
+# 사용법: DATABASE_URL=postgresql://... python check_query_plans.py
+# 댓글이 가장 많은 게시글로 post_comments의 EXPLAIN을 맞춤 계획 / 일반 계획(PREPARE 재사용 시) 모두 확인하여
+# 댓글 좋아요를 GROUP BY로 모아 세는 집계(HashAggregate, GroupAggregate 등)가 있으면 종료 코드 1을 반환합니다.
+# 좋아요 수는 게시글의 댓글마다 따로 세어야 하므로 계획에는 단순 집계(Aggregate, Plain)만 있어야 합니다.
+import re
+import sys
+
+from psycopg2.extras import RealDictCursor
+
+from app import POST_COMMENTS, connect_primary, prepared_statements
+
+# 전체를 모아 그룹별로 세는 집계 방식 (Plain은 한 번에 한 댓글만 세는 집계)
+GROUPING_STRATEGIES = {'Sorted', 'Hashed', 'Mixed'}
+
+
+def sample_post(cur):
+    """댓글이 가장 많은 게시글 (없으면 아무 게시글)"""
+    cur.execute("""
+        SELECT p.id, p.meal_date
+        FROM posts p
+        LEFT JOIN comments c ON c.post_id = p.id AND c.meal_date = p.meal_date
+        GROUP BY p.id, p.meal_date
+        ORDER BY COUNT(c.id) DESC
+        LIMIT 1
+    """)
+    post = cur.fetchone()
+    if not post:
+        print("게시글이 없습니다. 게시글을 하나 이상 작성한 뒤 실행하세요.")
+        sys.exit(1)
+    return post
+
+
+def plan_nodes(node, depth=0):
+    """실행 계획 트리를 (깊이, 노드) 순서로 펼침"""
+    yield depth, node
+    for child in node.get('Plans', []):
+        yield from plan_nodes(child, depth + 1)
+
+
+def explain(cur, sql, params):
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    return cur.fetchone()['QUERY PLAN'][0]['Plan']
+
+
+def check_plan(label, plan):
+    """계획을 출력하고 그룹 집계 노드 목록을 반환"""
+    print(label)
+    problems = []
+    for depth, node in plan_nodes(plan):
+        relation = f" on {node['Relation Name']}" if 'Relation Name' in node else ''
+        strategy = f" ({node['Strategy']})" if 'Strategy' in node else ''
+        print(f"  {'  ' * depth}{node['Node Type']}{strategy}{relation}")
+        if node['Node Type'] == 'Aggregate' and node.get('Strategy') in GROUPING_STRATEGIES:
+            problems.append(f"{label}: {node['Strategy']} Aggregate")
+    return problems
+
+
+def main():
+    conn = connect_primary()
+    cur = conn.cursor(cursor_factory=RealDictCursor)
+    post = sample_post(cur)
+    params = (post['meal_date'], post['id'], post['meal_date'])
+    sql, _ = prepared_statements._statements[POST_COMMENTS]
+
+    problems = check_plan("post_comments (맞춤 계획)", explain(cur, re.sub(r'\$\d+', '%s', sql), params))
+
+    # PREPARE 후 여러 번 실행되면 쓰이는 일반 계획도 확인
+    cur.execute("SET plan_cache_mode = force_generic_plan")
+    prepared_statements.execute(cur, POST_COMMENTS, params)
+    problems += check_plan("post_comments (일반 계획)", explain(cur, f"EXECUTE {POST_COMMENTS} (%s, %s, %s)", params))
+    conn.rollback()
+
+    cur.close()
+    conn.close()
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    print("OK" if not problems else f"{len(problems)}건 실패")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
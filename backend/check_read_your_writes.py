@@ -0,0 +1,111 @@
+# backend/check_read_your_writes.py - 주 DB + 복제 DB 두 대로 쓰기 후 읽기 일관성 확인
+#
+# 사용법: DATABASE_URL=postgresql://...(주 DB) REPLICA_DATABASE_URLS=postgresql://...(스트리밍 복제본) \
+#         python check_read_your_writes.py
+# 복제본의 WAL 재생을 잠시 멈춘 상태(복제 지연)에서
+#   1. 다른 주소의 사용자가 게시글 목록을 조회하면 복제 DB에서 읽는지
+#   2. 사용자 정보 없이 게시글을 작성한 클라이언트가 ?user_identifier=anonymous 로 목록을 조회하면
+#      주 DB에서 읽고 방금 쓴 게시글이 보이는지
+# 확인합니다. 재생 일시 정지에는 복제 DB의 슈퍼유저 권한이 필요하며, 실패가 하나라도 있으면 종료 코드 1을 반환합니다.
+import os
+import sys
+import uuid
+from datetime import date
+
+import psycopg2
+
+os.environ.setdefault('READ_YOUR_WRITES_WINDOW', '30')
+os.environ.setdefault('REPLICA_MAX_LAG', '30')  # 재생을 멈춘 동안 복제본이 읽기에서 제외되지 않도록
+os.environ.setdefault('IMAGE_WORKERS', '0')
+
+import app as appmod
+
+WRITER_ADDR = '10.0.0.1'
+OTHER_ADDR = '10.0.0.2'
+
+
+def server_of(dsn):
+    params = psycopg2.extensions.parse_dsn(dsn)
+    return params.get('host'), params.get('port', '5432'), params.get('dbname')
+
+
+def served_from(func, replica_dsn):
+    """요청 처리 중 get_db_connection이 돌려준 연결이 주 DB/복제 DB 중 어디인지 기록하는 래퍼"""
+    served = []
+    replica = server_of(replica_dsn)
+
+    def wrapper(*args, **kwargs):
+        conn = func(*args, **kwargs)
+        served.append('복제 DB' if server_of(conn.dsn) == replica else '주 DB')
+        return conn
+    return wrapper, served
+
+
+def main():
+    if not appmod.DATABASE_URL or not appmod.REPLICA_DATABASE_URLS:
+        print("DATABASE_URL과 REPLICA_DATABASE_URLS를 모두 지정하세요.")
+        sys.exit(1)
+    replica_dsn = appmod.REPLICA_DATABASE_URLS[0]
+
+    replica = psycopg2.connect(replica_dsn)
+    replica.autocommit = True
+    replica_cur = replica.cursor()
+    replica_cur.execute("SELECT pg_is_in_recovery()")
+    if not replica_cur.fetchone()[0]:
+        print(f"{replica_dsn} 는 복제본(recovery 상태)이 아닙니다.")
+        sys.exit(1)
+
+    wrapper, served = served_from(appmod.get_db_connection, replica_dsn)
+    appmod.get_db_connection = wrapper
+    client = appmod.app.test_client()
+    meal_date, meal_type = date.today().isoformat(), '중식'
+    feed_url = f'/api/posts?date={meal_date}&meal_type={meal_type}&user_identifier=anonymous'
+    title = f'read-your-writes {uuid.uuid4().hex[:8]}'
+
+    def read_feed(addr):
+        """(읽은 DB, 게시글 제목 목록)"""
+        served.clear()
+        response = client.get(feed_url, environ_base={'REMOTE_ADDR': addr})
+        titles = [post['title'] for post in response.get_json()]
+        return served[-1] if served else None, titles
+
+    problems = []
+    post_id = None
+    replica_cur.execute("SELECT pg_wal_replay_pause()")
+    try:
+        db, _ = read_feed(OTHER_ADDR)
+        print(f"작성 전 다른 사용자 조회: {db}")
+        if db != '복제 DB':
+            problems.append("작성 전 조회가 복제 DB로 가지 않음")
+
+        response = client.post('/api/posts', environ_base={'REMOTE_ADDR': WRITER_ADDR}, json={
+            'title': title, 'content': '쓰기 후 읽기 확인', 'author': 'check',
+            'meal_date': meal_date, 'meal_type': meal_type,
+        })
+        post_id = response.get_json().get('id')
+        print(f"게시글 작성: {response.status_code} id={post_id}")
+
+        db, titles = read_feed(WRITER_ADDR)
+        print(f"작성자 조회: {db}, 새 게시글 {'있음' if title in titles else '없음'}")
+        if db != '주 DB' or title not in titles:
+            problems.append("작성자가 방금 쓴 게시글을 주 DB에서 읽지 못함")
+
+        db, titles = read_feed(OTHER_ADDR)
+        print(f"다른 사용자 조회: {db}, 새 게시글 {'있음' if title in titles else '없음 (복제 지연)'}")
+    finally:
+        replica_cur.execute("SELECT pg_wal_replay_resume()")
+        replica.close()
+        if post_id:
+            primary = psycopg2.connect(appmod.DATABASE_URL)
+            with primary, primary.cursor() as cur:
+                cur.execute("DELETE FROM posts WHERE id = %s AND meal_date = %s", (post_id, meal_date))
+            primary.close()
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    print("OK" if not problems else f"{len(problems)}건 실패")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# crawler/benchmark_parser.py - 학교 사이트 접속 없이 식단표 파서 성능/정확도 확인
+#
+# 사용법: python benchmark_parser.py [반복 횟수]
+# fixtures/*.html 을 파싱하여 같은 이름의 .json(기대 결과)과 비교하고 페이지당 파싱 시간을 출력합니다.
+import glob
+import json
+import logging
+import os
+import sys
+import time
+
+from crawler import HTML_PARSER, parse_menu_html
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def available_parsers():
+    """비교 대상 파서 목록 (기본 파서를 먼저)"""
+    parsers = [HTML_PARSER]
+    if 'html.parser' not in parsers:
+        parsers.append('html.parser')
+    return parsers
+
+
+def benchmark(html, parser, iterations):
+    """페이지당 평균 파싱 시간(ms)과 마지막 파싱 결과를 반환"""
+    # 첫 파싱 때 불러오는 bs4/파서 모듈 시간은 제외
+    result = parse_menu_html(html, parser)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = parse_menu_html(html, parser)
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1000, result
+
+
+def comparable(result):
+    """기대 결과(JSON)와 비교할 수 있도록 MenuDate('menu_date')를 뺀 결과"""
+    if result is None:
+        return None
+    return [{k: v for k, v in meal.items() if k != 'menu_date'} for meal in result]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    # 반복 파싱 중 로그 출력 비용이 측정에 섞이지 않도록 비활성화
+    logging.disable(logging.CRITICAL)
+
+    failures = 0
+    for html_path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+        name = os.path.basename(html_path)
+        with open(html_path, 'rb') as f:
+            html = f.read()
+
+        expected_path = os.path.splitext(html_path)[0] + '.json'
+        expected = None
+        if os.path.exists(expected_path):
+            with open(expected_path, encoding='utf-8') as f:
+                expected = json.load(f)
+
+        for parser in available_parsers():
+            ms_per_page, result = benchmark(html, parser, iterations)
+            status = 'OK'
+            if os.path.exists(expected_path) and comparable(result) != expected:
+                status = 'MISMATCH'
+                failures += 1
+            print(f"{name:<24} {parser:<12} {len(html):>8} bytes  {ms_per_page:8.3f} ms/page  {status}")
+
+    if failures:
+        print(f"기대 결과와 다른 파싱 결과: {failures}건")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# crawler/benchmark_startup.py - 크롤러 시작 시간(DB 연결 준비까지) 측정과 모듈 불러오기 시간 분석
+#
+# 사용법: DB_HOST=... DB_PASSWORD=... python benchmark_startup.py [반복 횟수] [예산(초)]
+#   1. python -X importtime 으로 crawler 모듈을 불러올 때 패키지별로 걸리는 시간 상위 목록을 출력
+#   2. 새 프로세스에서 crawler 모듈을 불러오고 wait_for_db()가 성공할 때까지 걸린 시간을 반복 측정
+# 측정값의 중앙값이 예산(기본 STARTUP_BUDGET 환경변수 또는 2초)을 넘으면 종료 코드 1을 반환합니다.
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_BUDGET = float(os.environ.get('STARTUP_BUDGET', 2.0))
+READY_SCRIPT = "import sys, crawler; sys.exit(0 if crawler.wait_for_db() else 1)"
+
+
+def import_profile(module, top=10):
+    """모듈을 새 프로세스에서 불러오며 최상위 패키지별 누적 시간(ms) 상위 목록을 반환"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=CRAWLER_DIR, capture_output=True, text=True)
+    # importtime은 하위 모듈을 먼저 출력하므로, module 줄 바로 앞의 한 단계 들여쓴 항목이 module이 직접 불러온 모듈
+    totals = {}
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == module:
+                for child, ms in children:
+                    package = child.split('.')[0]
+                    totals[package] = totals.get(package, 0) + ms
+            children = []
+        elif depth == 1:
+            children.append((name.strip(), int(cumulative) / 1000))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def time_to_ready():
+    """프로세스 시작부터 DB 연결 확인까지 걸린 시간(초)"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', READY_SCRIPT], cwd=CRAWLER_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"DB에 연결할 수 없습니다:\n{result.stderr[-500:]}")
+    return elapsed
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else STARTUP_BUDGET
+
+    print("crawler 모듈 불러오기 (패키지별 누적 ms)")
+    for package, ms in import_profile('crawler'):
+        print(f"  {package:<24} {ms:8.1f}")
+
+    timings = [time_to_ready() for _ in range(iterations)]
+    median = statistics.median(timings)
+    print(f"DB 연결 준비까지: 중앙값 {median:.3f}s, 최소 {min(timings):.3f}s, 최대 {max(timings):.3f}s "
+          f"({iterations}회, 예산 {budget:.1f}s)")
+    if median > budget:
+        print("FAIL 시작 시간이 예산을 넘었습니다")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
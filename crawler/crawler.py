@@ -1,12 +1,20 @@
 import os
 import time
-import schedule
 import psycopg2
-from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
+from psycopg2.extras import execute_values
+from datetime import datetime, timedelta, date
 import logging
 import re
+import json
+import sys
+import select
+import argparse
+import threading
+import importlib.util
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 
 # 로깅 설정
 logging.basicConfig(
@@ -21,32 +29,138 @@ DB_NAME = os.environ.get('DB_NAME', 'schoolmealdb')
 DB_USER = os.environ.get('DB_USER', 'schoolmeal')
 DB_PASSWORD = os.environ.get('DB_PASSWORD', 'securepassword')
 
+# DB 연결 대기 (처음에는 짧게, 실패할 때마다 두 배로 늘려 DB_WAIT_MAX_DELAY까지)
+DB_WAIT_TIMEOUT = float(os.environ.get('DB_WAIT_TIMEOUT', 150))  # 전체 대기 시간(초)
+DB_WAIT_INITIAL_DELAY = float(os.environ.get('DB_WAIT_INITIAL_DELAY', 0.2))  # 첫 재시도까지(초)
+DB_WAIT_MAX_DELAY = float(os.environ.get('DB_WAIT_MAX_DELAY', 5))  # 재시도 간격 최대값(초)
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 5))  # 연결 시도 한 번의 제한 시간(초)
+
+# 크롤링 대상 캠퍼스 목록
+# CRAWL_SOURCES 환경변수로 JSON 배열을 지정 (예: [{"school": "jungsu", "url": "...", "timeout": 10}])
+# 과거 식단 백필에는 주별 페이지 URL 템플릿 week_url({date} = 해당 주 월요일)이 필요합니다.
+DEFAULT_SCHOOL = os.environ.get('DEFAULT_SCHOOL', 'jungsu')
+DEFAULT_SOURCES = [
+    {'school': DEFAULT_SCHOOL, 'url': 'https://www.kopo.ac.kr/jungsu/content.do?menu=247'}
+]
+
+# 동시 크롤링 설정
+CRAWL_WORKERS = int(os.environ.get('CRAWL_WORKERS', 8))  # 전체 동시 작업 수
+CRAWL_TIMEOUT = float(os.environ.get('CRAWL_TIMEOUT', 15))  # 소스별 기본 요청 타임아웃(초)
+HOST_CONCURRENCY = int(os.environ.get('CRAWL_HOST_CONCURRENCY', 2))  # 호스트별 동시 요청 수
+HOST_MIN_INTERVAL = float(os.environ.get('CRAWL_HOST_INTERVAL', 0.5))  # 호스트별 요청 시작 간격(초)
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
+}
+
+# 메뉴 내용을 음식 단위로 나누는 규칙
+MENU_ITEM_SEPARATORS = re.compile(r'[,/\n·]+')
+ALLERGY_SUFFIX = re.compile(r'\s*(\([\d.,\s]*\)|[\d.]+)$')  # 제육볶음(1.5.10) / 제육볶음1.5.10.
+EMPTY_MENU = "정보 없음"
+
+# 날짜 셀 해석 규칙 (행마다 다시 컴파일하지 않도록 한 번만 컴파일)
+FULL_DATE_PATTERN = re.compile(r'(?<!\d)(\d{4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})(?!\d)')  # 2025-06-02 / 2025.6.2 / 2025년 6월 2일
+MONTH_DAY_PATTERN = re.compile(r'(?<!\d)(\d{1,2})\s*[-./월]\s*(\d{1,2})(?!\d)')  # 06/02 / 6.2 / 6월 2일
+WEEKDAY_PATTERN = re.compile(r'([월화수목금토일])요일|\(([월화수목금토일])\)')  # 월요일 / (월)
+WEEKDAY_NAMES = '월화수목금토일'
+MONTH_DAY_MAX_DISTANCE = 183  # 연도 없는 날짜는 기준일에서 이 일수 이내인 연도로만 해석
+
+# HTML 파서 설정 (lxml이 설치되어 있으면 C 기반 파서 사용, 설치 여부만 확인하고 불러오지는 않음)
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# 식단표 선택자 (페이지 전체가 아닌 식단표 테이블만 파싱)
+MENU_TABLE_SELECTOR = 'table.tbl_table.menu'
+MENU_TABLE_CLASS = re.compile(r'(^|\s)menu(\s|$)')
+
+# 크롤링 대상 목록 로드
+def load_sources():
+    """CRAWL_SOURCES 환경변수에서 크롤링 대상 목록을 읽습니다. 없거나 잘못되면 기본값을 사용합니다."""
+    raw = os.environ.get('CRAWL_SOURCES')
+    if not raw:
+        return DEFAULT_SOURCES
+    
+    try:
+        sources = json.loads(raw)
+        valid = [s for s in sources if s.get('school') and s.get('url')]
+        if len(valid) != len(sources):
+            logger.warning("school 또는 url이 없는 크롤링 대상은 제외합니다.")
+        if valid:
+            return valid
+    except (ValueError, AttributeError, TypeError) as e:
+        logger.error(f"CRAWL_SOURCES 형식 오류: {e}")
+    
+    logger.warning("기본 크롤링 대상을 사용합니다.")
+    return DEFAULT_SOURCES
+
+# 호스트별 요청 제한
+class HostThrottle:
+    """같은 호스트에 대한 동시 요청 수와 요청 시작 간격을 제한합니다."""
+    
+    def __init__(self, concurrency=HOST_CONCURRENCY, min_interval=HOST_MIN_INTERVAL):
+        self.concurrency = max(1, concurrency)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+    
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.concurrency)
+            return self._semaphores[host]
+    
+    def _reserve_slot(self, host):
+        """다음 요청 시작 시각을 예약하고 기다려야 할 시간을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+            return start - now
+    
+    def get(self, url, timeout):
+        host = urlparse(url).netloc
+        with self._semaphore(host):
+            wait = self._reserve_slot(host)
+            if wait > 0:
+                time.sleep(wait)
+            import requests  # 페이지를 가져올 때만 필요 (파티션 관리 등 DB 명령은 불러오지 않음)
+            return requests.get(url, headers=REQUEST_HEADERS, timeout=timeout)
+
+host_throttle = HostThrottle()
+
 # 데이터베이스 연결 재시도 함수
-def wait_for_db(max_retries=30, delay=5):
-    """데이터베이스 연결을 기다립니다."""
-    retries = 0
+def wait_for_db(timeout=DB_WAIT_TIMEOUT, initial_delay=DB_WAIT_INITIAL_DELAY, max_delay=DB_WAIT_MAX_DELAY):
+    """데이터베이스 연결을 기다립니다.
+
+    컨테이너가 함께 재시작될 때 DB가 곧 준비되는 경우가 많으므로 처음에는 짧게 기다리고,
+    실패할 때마다 간격을 두 배로 늘려 max_delay까지 재시도합니다. timeout(초)이 지나면 포기합니다.
+    """
+    logger.info(f"데이터베이스 연결 대기 중... (host={DB_HOST}, db={DB_NAME}, user={DB_USER})")
+    started = time.monotonic()
+    delay = initial_delay
+    attempt = 0
     
-    while retries < max_retries:
+    while True:
+        attempt += 1
         try:
-            logger.info(f"데이터베이스 연결 시도 중... (시도 {retries+1}/{max_retries})")
-            logger.info(f"DB 접속 정보: host={DB_HOST}, db={DB_NAME}, user={DB_USER}")
-            
             conn = psycopg2.connect(
                 host=DB_HOST,
                 database=DB_NAME,
                 user=DB_USER,
-                password=DB_PASSWORD
+                password=DB_PASSWORD,
+                connect_timeout=DB_CONNECT_TIMEOUT
             )
             conn.close()
-            logger.info("데이터베이스 연결 성공!")
+            logger.info(f"데이터베이스 연결 성공! ({attempt}번째 시도, {time.monotonic() - started:.1f}초)")
             return True
         except Exception as e:
-            retries += 1
-            logger.warning(f"데이터베이스 연결 실패 (시도 {retries}/{max_retries}): {e}")
-            time.sleep(delay)
-    
-    logger.error("최대 재시도 횟수를 초과했습니다. 데이터베이스에 연결할 수 없습니다.")
-    return False
+            remaining = timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                logger.error(f"{timeout:.0f}초 동안 데이터베이스에 연결할 수 없습니다: {e}")
+                return False
+            logger.warning(f"데이터베이스 연결 실패 (시도 {attempt}), {min(delay, remaining):.1f}초 후 재시도: {e}")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
 
 # Holiday 체크 함수
 def get_holiday(*menus):
@@ -59,165 +173,455 @@ def get_holiday(*menus):
     else:
         return False
 
-# 날짜가 주말인지 확인하는 함수
-def is_weekend(date_str):
-    try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        # 5: 토요일, 6: 일요일 (파이썬의 weekday()는 0:월요일, 6:일요일)
-        return date.weekday() >= 5
-    except Exception as e:
-        logger.warning(f"날짜 형식 변환 오류: {e}, 주말이 아닌 것으로 처리")
-        return False
+# 식단 행 하나의 날짜 (파싱 단계에서 한 번 만들어 저장 단계까지 그대로 사용)
+class MenuDate(namedtuple('MenuDate', ['date', 'iso', 'weekday', 'is_weekend', 'weekday_only'])):
+    """date: datetime.date, iso: 'YYYY-MM-DD', weekday: 0(월)~6(일), is_weekend: 토/일 여부,
+    weekday_only: 셀에 요일만 있어 기준 주로 날짜를 계산했는지 여부"""
+    __slots__ = ()
+    
+    @classmethod
+    def of(cls, day, weekday_only=False):
+        weekday = day.weekday()
+        return cls(day, day.isoformat(), weekday, weekday >= 5, weekday_only)
+    
+    @property
+    def weekday_name(self):
+        return WEEKDAY_NAMES[self.weekday]
+
+# 날짜 셀 해석 함수
+def resolve_menu_date(cell, week_start=None, today=None):
+    """날짜 셀 문자열을 MenuDate로 해석하여 (MenuDate, None)을 반환합니다.
 
-# 날짜 문자열 파싱 함수
-def parse_date(date_str, index=0):
-    """날짜 문자열을 파싱하여 YYYY-MM-DD 형식으로 반환합니다."""
-    logger.info(f"파싱할 날짜 문자열: {date_str}")
+    해석할 수 없거나 모호하면 추측하지 않고 (None, 사유)를 반환합니다.
+    - 전체 날짜(2025-06-02, 2025.6.2, 2025년 6월 2일): 요일이 함께 있으면 서로 맞아야 합니다.
+    - 월/일(06/02, 6.2, 6월 2일): week_start(없으면 today)에 가장 가까운 연도로 정하며,
+      요일이 있으면 요일이 맞는 연도만 고릅니다. 후보가 하나가 아니면 모호한 것으로 봅니다.
+    - 요일만(월요일, (월)): week_start(해당 주 월요일), 없으면 이번주 기준으로 계산합니다.
+    """
+    weekday = None
+    weekday_match = WEEKDAY_PATTERN.search(cell)
+    if weekday_match:
+        weekday = WEEKDAY_NAMES.index(weekday_match.group(1) or weekday_match.group(2))
     
-    # YYYY-MM-DD 형식인 경우
-    date_pattern = r'(\d{4}-\d{2}-\d{2})'
-    match = re.search(date_pattern, date_str)
+    match = FULL_DATE_PATTERN.search(cell)
+    if match:
+        try:
+            day = date(*map(int, match.groups()))
+        except ValueError:
+            return None, f"존재하지 않는 날짜 '{match.group(0)}'"
+        if weekday is not None and day.weekday() != weekday:
+            return None, f"날짜 '{match.group(0)}'와 요일 '{WEEKDAY_NAMES[weekday]}' 불일치"
+        return MenuDate.of(day), None
     
+    reference = week_start or today or datetime.now().date()
+    if isinstance(reference, datetime):
+        reference = reference.date()
+    
+    match = MONTH_DAY_PATTERN.search(cell)
     if match:
-        return match.group(1)
-    
-    # 요일만 있는 경우, 이번주 기준으로 계산
-    weekday_map = {'월요일': 0, '화요일': 1, '수요일': 2, '목요일': 3, '금요일': 4, '토요일': 5, '일요일': 6}
-    if date_str in weekday_map:
-        today = datetime.now()
-        today_weekday = today.weekday()  # 0=월요일, 1=화요일, ...
-        target_weekday = weekday_map[date_str]
-        
-        # 이번주 해당 요일의 날짜 계산
-        days_from_monday = target_weekday  # 월요일부터 며칠째인지
-        this_monday = today - timedelta(days=today_weekday)  # 이번주 월요일
-        target_date = this_monday + timedelta(days=days_from_monday)
-        
-        logger.info(f"요일 '{date_str}' -> 이번주 {target_date.strftime('%Y-%m-%d')}")
-        return target_date.strftime('%Y-%m-%d')
+        month, day_of_month = map(int, match.groups())
+        candidates = []
+        for year in (reference.year - 1, reference.year, reference.year + 1):
+            try:
+                day = date(year, month, day_of_month)
+            except ValueError:
+                continue
+            if weekday is not None and day.weekday() != weekday:
+                continue
+            if abs((day - reference).days) <= MONTH_DAY_MAX_DISTANCE:
+                candidates.append(day)
+        if len(candidates) != 1:
+            return None, f"연도를 정할 수 없는 날짜 '{match.group(0)}' (기준일 {reference}, 후보 {len(candidates)}개)"
+        return MenuDate.of(candidates[0]), None
     
-    # 다른 형식이거나 날짜를 찾을 수 없는 경우, 현재 날짜 + 인덱스를 사용
-    today = datetime.now()
-    target_date = today + timedelta(days=index)
-    logger.warning(f"날짜 파싱 실패, 기본값 사용: {target_date.strftime('%Y-%m-%d')}")
-    return target_date.strftime('%Y-%m-%d')
+    if any(ch.isdigit() for ch in cell):
+        return None, "알 수 없는 날짜 형식"
+    
+    if weekday is not None:
+        monday = reference - timedelta(days=reference.weekday())
+        return MenuDate.of(monday + timedelta(days=weekday), weekday_only=True), None
+    
+    return None, "날짜 정보 없음"
 
-# 크롤링 함수
-def crawl_menu():
-    logger.info("학식 메뉴 크롤링 시작")
+# 식단표 HTML 파싱 함수
+def parse_menu_html(html, parser=None, week_start=None, skipped=None):
+    """식단 페이지 HTML(bytes 또는 str)에서 메뉴 목록을 추출합니다.
+
+    네트워크나 DB에 접근하지 않는 순수 함수이며, 식단표를 찾지 못하면 None을 반환합니다.
+    week_start는 요일만 표시된 행의 날짜를 계산할 기준 주(월요일)입니다.
+    각 항목의 'menu_date'에 해석된 MenuDate가 들어가며, 날짜를 해석할 수 없는 행은 제외하고
+    skipped 목록이 주어지면 (날짜 셀, 사유)를 추가합니다.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer  # 파싱할 때만 필요
     
-    try:
-        # 요청 라이브러리를 사용하여 페이지 가져오기
-        logger.info("페이지 요청 중...")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
-        }
-        url = 'https://www.kopo.ac.kr/jungsu/content.do?menu=247'
+    # 식단표(table.menu)만 트리로 만들어 나머지 페이지 파싱 비용을 줄임
+    soup = BeautifulSoup(html, parser or HTML_PARSER, parse_only=SoupStrainer('table', class_=MENU_TABLE_CLASS))
+    
+    # 테이블 찾기
+    table = soup.select_one(MENU_TABLE_SELECTOR)
+    if not table:
+        logger.error("식단표를 찾을 수 없습니다.")
+        return None
+    
+    # tbody 찾기
+    tbody = table.select_one('tbody')
+    if not tbody:
+        logger.error("식단표 본문을 찾을 수 없습니다.")
+        return None
+    
+    rows = tbody.find_all('tr')
+    logger.info(f"발견된 행 수: {len(rows)}")
+    
+    today = datetime.now().date()
+    meal_list = []
+    for i, row in enumerate(rows):
+        tds = row.find_all('td')
+        logger.debug(f"행 {i+1}의 셀 수: {len(tds)}")
         
-        import requests
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # 오류가 있으면 예외 발생
+        if len(tds) < 4:
+            logger.warning(f"행 {i+1}에 예상보다 적은 셀이 있습니다. 건너뜁니다.")
+            continue
         
-        # HTML 파싱
-        logger.info("HTML 파싱 중...")
-        html = response.text
-        soup = BeautifulSoup(html, 'html.parser')
+        # 첫 번째 셀에서 날짜 정보 추출
+        date_cell = tds[0].get_text(strip=True)
+        logger.debug(f"날짜 셀 내용: {date_cell}")
         
-        # 테이블 찾기
-        table = soup.select_one('#contents > div > div.meal_box > table.tbl_table.menu')
-        if not table:
-            logger.error("식단표를 찾을 수 없습니다.")
-            table_candidates = soup.find_all('table')
-            logger.info(f"페이지에서 발견된 테이블 수: {len(table_candidates)}")
-            for i, t in enumerate(table_candidates):
-                logger.info(f"테이블 {i+1} 클래스: {t.get('class', '없음')}")
-            logger.info("더미 데이터를 생성합니다.")
-            return generate_dummy_data_and_save()
+        # 날짜 해석 (모호하면 다른 날짜로 저장되지 않도록 행을 제외)
+        menu_date, reason = resolve_menu_date(date_cell, week_start, today)
+        if menu_date is None:
+            logger.warning(f"행 {i+1} 날짜 해석 실패({reason}), 건너뜁니다: {date_cell}")
+            if skipped is not None:
+                skipped.append((date_cell, reason))
+            continue
         
-        # tbody 찾기
-        tbody = table.select_one('tbody')
-        if not tbody:
-            logger.error("식단표 본문을 찾을 수 없습니다.")
-            logger.info("더미 데이터를 생성합니다.")
-            return generate_dummy_data_and_save()
+        # 주말인 경우 건너뛰기
+        if menu_date.is_weekend:
+            logger.debug(f"주말 데이터 {menu_date.iso} 제외")
+            continue
         
-        rows = tbody.find_all('tr')
-        logger.info(f"발견된 행 수: {len(rows)}")
+        # 메뉴 내용 추출
+        breakfast, lunch, dinner = "", "", ""
         
-        meal_list = []
-        for i, row in enumerate(rows):
-            tds = row.find_all('td')
-            logger.info(f"행 {i+1}의 셀 수: {len(tds)}")
-            
-            if len(tds) < 4:
-                logger.warning(f"행 {i+1}에 예상보다 적은 셀이 있습니다. 건너뜁니다.")
-                continue
-            
-            # 첫 번째 셀에서 날짜 정보 추출
-            date_cell = tds[0].get_text(strip=True)
-            logger.info(f"날짜 셀 내용: {date_cell}")
-            
-            # 날짜 형식 확인 및 변환
-            date_only = parse_date(date_cell, i)
-            
-            # 주말인 경우 건너뛰기
-            if is_weekend(date_only):
-                logger.info(f"주말 데이터 {date_only} 제외")
-                continue
-            
-            # 요일 정보
-            weekday = ""
-            weekday_match = re.search(r'[월화수목금토일]요일', date_cell)
-            if weekday_match:
-                weekday = weekday_match.group(0).replace('요일', '')
-            
-            # 메뉴 내용 추출
-            breakfast, lunch, dinner = "", "", ""
-            
-            try:
-                breakfast_span = tds[1].find('span')
-                breakfast = breakfast_span.get_text(strip=True).replace('\n', '') if breakfast_span else ""
-            except Exception as e:
-                logger.warning(f"아침 메뉴 파싱 오류: {e}")
+        try:
+            breakfast_span = tds[1].find('span')
+            breakfast = breakfast_span.get_text(strip=True).replace('\n', '') if breakfast_span else ""
+        except Exception as e:
+            logger.warning(f"아침 메뉴 파싱 오류: {e}")
+        
+        try:
+            lunch_span = tds[2].find('span')
+            lunch = lunch_span.get_text(strip=True).replace('\n', '') if lunch_span else ""
+        except Exception as e:
+            logger.warning(f"점심 메뉴 파싱 오류: {e}")
+        
+        try:
+            dinner_span = tds[3].find('span')
+            dinner = dinner_span.get_text(strip=True).replace('\n', '') if dinner_span else ""
+        except Exception as e:
+            logger.warning(f"저녁 메뉴 파싱 오류: {e}")
+        
+        is_holiday = get_holiday(breakfast, lunch, dinner)
+        
+        meal_list.append({
+            'date': menu_date.iso,
+            'weekday': menu_date.weekday_name,
+            'menu_date': menu_date,
+            'breakfast': breakfast or "정보 없음",
+            'lunch': lunch or "정보 없음",
+            'dinner': dinner or "정보 없음",
+            'is_holiday': is_holiday
+        })
+    
+    # 파싱된 데이터 요약
+    logger.info(f"파싱된 메뉴 항목 수: {len(meal_list)}")
+    for meal in meal_list:
+        logger.debug(f"날짜: {meal['date']}, 요일: {meal['weekday']}")
+    
+    return meal_list
+
+# 크롤링 단계별 측정
+class CrawlRunMetrics:
+    """한 번의 캠퍼스 크롤링에서 단계별 소요 시간과 처리량을 모읍니다."""
+    
+    def __init__(self, school):
+        self.school = school
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.durations = {'fetch': None, 'parse': None, 'save': None}
+        self.bytes_fetched = None
+        self.rows_parsed = None
+        self.rows_skipped = None
+        self.stats = {}
+        self.fallback = False
+        self.error = None
+    
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = (time.perf_counter() - started) * 1000
+    
+    def record(self):
+        """측정 결과를 crawl_runs 테이블에 저장합니다. 실패해도 크롤링에는 영향을 주지 않습니다."""
+        total_ms = (time.perf_counter() - self._started) * 1000
+        logger.info(
+            f"[{self.school}] 단계별 소요 시간(ms): "
+            + ", ".join(f"{k}={v:.1f}" for k, v in self.durations.items() if v is not None)
+            + f", total={total_ms:.1f}"
+        )
+        
+        conn = None
+        try:
+            conn = psycopg2.connect(
+                host=DB_HOST,
+                database=DB_NAME,
+                user=DB_USER,
+                password=DB_PASSWORD
+            )
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO crawl_runs (school, started_at, fetch_ms, parse_ms, save_ms, total_ms, "
+                    "bytes_fetched, rows_parsed, rows_skipped, rows_inserted, rows_updated, rows_unchanged, fallback, error) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);",
+                    (self.school, self.started_at, self.durations['fetch'], self.durations['parse'],
+                     self.durations['save'], total_ms, self.bytes_fetched, self.rows_parsed, self.rows_skipped,
+                     self.stats.get('inserted'), self.stats.get('updated'), self.stats.get('unchanged'),
+                     self.fallback, self.error)
+                )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"[{self.school}] 크롤링 측정 결과 저장 실패: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+# 크롤링 함수
+def crawl_menu(source=None):
+    """하나의 캠퍼스 식단 페이지를 크롤링하여 저장합니다.
+
+    메뉴 변경 여부(changed), 휴일 날짜(holidays), 더미 데이터 사용 여부(fallback)를 반환합니다.
+    단계별(fetch/parse/save) 측정 결과는 crawl_runs 테이블에 기록됩니다.
+    """
+    source = source or DEFAULT_SOURCES[0]
+    school = source['school']
+    result = {'school': school, 'changed': False, 'holidays': set(), 'fallback': False}
+    metrics = CrawlRunMetrics(school)
+    logger.info(f"[{school}] 학식 메뉴 크롤링 시작")
+    
+    try:
+        # 호스트별 제한을 지키며 페이지 가져오기
+        logger.info(f"[{school}] 페이지 요청 중...")
+        with metrics.stage('fetch'):
+            response = host_throttle.get(source['url'], timeout=source.get('timeout', CRAWL_TIMEOUT))
+            response.raise_for_status()  # 오류가 있으면 예외 발생
+            metrics.bytes_fetched = len(response.content)
+        
+        # HTML 파싱 (인코딩 판별은 파서에 맡기기 위해 bytes 그대로 전달)
+        logger.info(f"[{school}] HTML 파싱 중...")
+        skipped = []
+        with metrics.stage('parse'):
+            meal_list = parse_menu_html(response.content, skipped=skipped)
+        metrics.rows_skipped = len(skipped)
+        
+        if meal_list is None:
+            logger.info(f"[{school}] 더미 데이터를 생성합니다.")
+            metrics.error = "menu table not found"
+        else:
+            metrics.rows_parsed = len(meal_list)
             
+            # 데이터베이스 저장
+            with metrics.stage('save'):
+                stats = save_to_database(meal_list, school)
+            metrics.stats = stats
+            if stats.get('error'):
+                metrics.error = stats['error']
+            result['changed'] = stats['inserted'] + stats['updated'] > 0
+            result['holidays'] = {meal['date'] for meal in meal_list if meal['is_holiday']}
+        
+    except Exception as e:
+        logger.error(f"[{school}] 크롤링 중 오류 발생: {e}")
+        logger.info(f"[{school}] 더미 데이터 생성 중...")
+        metrics.error = str(e)
+        meal_list = None
+    
+    if meal_list is None:
+        generate_dummy_data_and_save(school)
+        result['fallback'] = metrics.fallback = True
+    
+    metrics.record()
+    return result
+
+# 전체 캠퍼스 동시 크롤링
+def crawl_all_sources(sources=None):
+    """설정된 모든 캠퍼스를 제한된 작업자 풀에서 동시에 크롤링합니다.
+
+    캠퍼스별 crawl_menu() 결과 목록을 반환합니다.
+    """
+    sources = sources or load_sources()
+    started = time.monotonic()
+    logger.info(f"{len(sources)}개 캠퍼스 크롤링 시작")
+    
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(CRAWL_WORKERS, len(sources)))) as executor:
+        futures = {executor.submit(crawl_menu, source): source for source in sources}
+        for future in as_completed(futures):
             try:
-                lunch_span = tds[2].find('span')
-                lunch = lunch_span.get_text(strip=True).replace('\n', '') if lunch_span else ""
+                results.append(future.result())
             except Exception as e:
-                logger.warning(f"점심 메뉴 파싱 오류: {e}")
-            
+                logger.error(f"[{futures[future]['school']}] 크롤링 작업 실패: {e}")
+    
+    logger.info(f"전체 크롤링 완료: {time.monotonic() - started:.1f}초")
+    return results
+
+# 메뉴 목록을 (date, meal_type) 단위 행으로 변환
+def build_menu_rows(meal_list):
+    """메뉴 목록을 {(date, meal_type): content} 형태로 변환합니다. 주말은 제외합니다."""
+    rows = {}
+    for meal in meal_list:
+        # 파서가 해석해 둔 날짜를 그대로 사용하고, 없으면(더미 데이터 등) 여기서 한 번만 해석
+        menu_date = meal.get('menu_date')
+        if menu_date is None:
             try:
-                dinner_span = tds[3].find('span')
-                dinner = dinner_span.get_text(strip=True).replace('\n', '') if dinner_span else ""
-            except Exception as e:
-                logger.warning(f"저녁 메뉴 파싱 오류: {e}")
-            
-            is_holiday = get_holiday(breakfast, lunch, dinner)
-            
-            meal_list.append({
-                'date': date_only,
-                'weekday': weekday,
-                'breakfast': breakfast or "정보 없음",
-                'lunch': lunch or "정보 없음",
-                'dinner': dinner or "정보 없음",
-                'is_holiday': is_holiday
-            })
+                menu_date = MenuDate.of(date.fromisoformat(meal['date']))
+            except (TypeError, ValueError):
+                logger.warning(f"유효하지 않은 날짜 형식: {meal['date']}, 저장 제외")
+                continue
+        date_str = menu_date.iso
         
-        # 파싱된 데이터 요약
-        logger.info(f"파싱된 메뉴 항목 수: {len(meal_list)}")
-        for meal in meal_list:
-            logger.info(f"날짜: {meal['date']}, 요일: {meal['weekday']}")
+        # 주말인 경우 저장하지 않음
+        if menu_date.is_weekend:
+            logger.info(f"주말 데이터 {date_str} 저장 제외")
+            continue
         
-        # 데이터베이스 저장
-        save_to_database(meal_list)
+        # 아침, 점심, 저녁 메뉴 (같은 키가 중복되면 마지막 값 사용)
+        for meal_type, db_meal_type in [('breakfast', '아침'), ('lunch', '점심'), ('dinner', '저녁')]:
+            rows[(date_str, db_meal_type)] = meal[meal_type]
+    
+    return rows
+
+# 메뉴 내용을 개별 음식으로 분리
+def split_menu_items(content):
+    """'쌀밥, 제육볶음(1.5), 김치' 같은 메뉴 내용을 음식 이름 목록으로 분리합니다.
+
+    알레르기 표시 숫자는 제거하고, 중복과 '정보 없음'은 제외합니다.
+    """
+    items = []
+    for raw in MENU_ITEM_SEPARATORS.split(content or ''):
+        dish = ALLERGY_SUFFIX.sub('', raw.strip()).strip()
+        if dish and dish != EMPTY_MENU and dish not in items:
+            items.append(dish[:100])
+    return items
+
+# 변경된 메뉴의 음식 목록 갱신
+def replace_menu_items(cur, school, changed_rows):
+    """changed_rows[(menu_day, meal_type, content)]에 해당하는 menu_items를 다시 만듭니다."""
+    if not changed_rows:
+        return
+    
+    execute_values(
+        cur,
+        "DELETE FROM menu_items m USING (VALUES %s) AS v(school, date, meal_type) "
+        "WHERE m.school = v.school AND m.date = v.date::date AND m.meal_type = v.meal_type;",
+        [(school, menu_day, meal_type) for menu_day, meal_type, _ in changed_rows],
+        page_size=len(changed_rows)
+    )
+    
+    items = [
+        (school, menu_day, meal_type, position, dish)
+        for menu_day, meal_type, content in changed_rows
+        for position, dish in enumerate(split_menu_items(content))
+    ]
+    if items:
+        execute_values(
+            cur,
+            "INSERT INTO menu_items (school, date, meal_type, position, dish) VALUES %s;",
+            items,
+            page_size=1000
+        )
+
+# 메뉴 행 일괄 upsert
+def upsert_menu_rows(cur, school, rows):
+    """주어진 커서로 메뉴 행을 한 문장에 upsert하고 inserted/updated/unchanged 건수를 반환합니다.
+
+    내용이 바뀌지 않은 행은 갱신하지 않으므로 불필요한 dead tuple과 WAL이 생기지 않습니다.
+    새로 저장되거나 바뀐 행은 menu_items(음식 단위 색인)도 함께 갱신합니다.
+    커밋은 호출하는 쪽에서 합니다.
+    """
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    if not rows:
+        return stats
+    
+    values = [(school, date_str, meal_type, content) for (date_str, meal_type), content in rows.items()]
+    
+    # xmax = 0 이면 새로 삽입된 행, 아니면 갱신된 행
+    result = execute_values(
+        cur,
+        "INSERT INTO meal_menu (school, date, meal_type, content) VALUES %s "
+        "ON CONFLICT (school, date, meal_type) DO UPDATE SET content = EXCLUDED.content "
+        "WHERE meal_menu.content IS DISTINCT FROM EXCLUDED.content "
+        "RETURNING (xmax = 0) AS inserted, date, meal_type, content;",
+        values,
+        page_size=len(values),
+        fetch=True
+    )
+    
+    replace_menu_items(cur, school, [(menu_day, meal_type, content) for _, menu_day, meal_type, content in result])
+    
+    stats['inserted'] = sum(1 for row in result if row[0])
+    stats['updated'] = len(result) - stats['inserted']
+    stats['unchanged'] = len(values) - len(result)
+    return stats
+
+# 기존 메뉴 전체의 음식 색인 재생성
+def rebuild_menu_items(batch_size=1000):
+    """meal_menu 전체를 읽어 menu_items를 다시 만듭니다. (음식 색인 도입 전 데이터용)"""
+    conn = psycopg2.connect(
+        host=DB_HOST,
+        database=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD
+    )
+    total = 0
+    try:
+        # 서버 측 커서로 나눠 읽어 메모리 사용량을 일정하게 유지
+        read_cur = conn.cursor(name='rebuild_menu_items')
+        read_cur.itersize = batch_size
+        read_cur.execute("SELECT school, date, meal_type, content FROM meal_menu ORDER BY school, date;")
         
-    except Exception as e:
-        logger.error(f"크롤링 중 오류 발생: {e}")
-        logger.info("더미 데이터 생성 중...")
-        generate_dummy_data_and_save()
+        by_school = {}
+        with conn.cursor() as write_cur:
+            for school, menu_day, meal_type, content in read_cur:
+                by_school.setdefault(school, []).append((menu_day, meal_type, content))
+                total += 1
+                if total % batch_size == 0:
+                    for key, changed_rows in by_school.items():
+                        replace_menu_items(write_cur, key, changed_rows)
+                    by_school = {}
+            for key, changed_rows in by_school.items():
+                replace_menu_items(write_cur, key, changed_rows)
+        read_cur.close()
+        conn.commit()
+    finally:
+        conn.close()
+    
+    logger.info(f"음식 색인 재생성 완료: 메뉴 {total}건")
+    return total
 
 # 데이터베이스에 저장
-def save_to_database(meal_list):
+def save_to_database(meal_list, school=DEFAULT_SCHOOL):
+    """메뉴 목록을 한 번의 배치 upsert로 저장하고 inserted/updated/unchanged 건수를 반환합니다.
+
+    저장에 실패하면 반환값의 error 항목에 오류 메시지가 담깁니다.
+    """
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    
+    rows = build_menu_rows(meal_list)
+    if not rows:
+        logger.info(f"[{school}] 저장할 메뉴 항목이 없습니다.")
+        return stats
+    
     conn = None
     try:
         conn = psycopg2.connect(
@@ -230,49 +634,30 @@ def save_to_database(meal_list):
         # 커서 생성
         cur = conn.cursor()
         
-        # 데이터를 DB에 삽입
-        inserted_count = 0
-        for meal in meal_list:
-            # 날짜가 YYYY-MM-DD 형식인지 확인
-            date_str = meal['date']
-            if len(date_str) != 10 or date_str.count('-') != 2:
-                # 현재 날짜로 대체
-                date_str = datetime.now().strftime('%Y-%m-%d')
-                logger.warning(f"유효하지 않은 날짜 형식: {meal['date']}, 현재 날짜로 대체: {date_str}")
-            
-            # 주말인 경우 저장하지 않음
-            if is_weekend(date_str):
-                logger.info(f"주말 데이터 {date_str} 저장 제외")
-                continue
-            
-            # 아침, 점심, 저녁 메뉴 삽입
-            for meal_type, db_meal_type in [('breakfast', '아침'), ('lunch', '점심'), ('dinner', '저녁')]:
-                menu = meal[meal_type]
-                
-                # meal_menu 테이블에 맞게 수정
-                cur.execute(
-                    "INSERT INTO meal_menu (date, meal_type, content) VALUES (%s, %s, %s) "
-                    "ON CONFLICT (date, meal_type) DO UPDATE SET content = EXCLUDED.content;",
-                    (date_str, db_meal_type, menu)
-                )
-                inserted_count += 1
+        # 전체 행을 하나의 문장으로 upsert
+        stats = upsert_menu_rows(cur, school, rows)
         
         # 변경사항 커밋
         conn.commit()
         cur.close()
         
-        logger.info(f"{inserted_count}개의 메뉴 항목이 데이터베이스에 저장되었습니다.")
+        logger.info(
+            f"[{school}] 메뉴 저장 완료: 신규 {stats['inserted']}개, 변경 {stats['updated']}개, "
+            f"동일 {stats['unchanged']}개"
+        )
         
     except Exception as e:
-        logger.error(f"데이터베이스 작업 중 오류 발생: {e}")
+        logger.error(f"[{school}] 데이터베이스 작업 중 오류 발생: {e}")
+        stats['error'] = str(e)
     finally:
         if conn:
             conn.close()
+    
+    return stats
 
 # 더미 데이터 생성
 def generate_dummy_data():
-    from datetime import datetime, timedelta
-    import random
+    import random  # 식단표를 가져오지 못했을 때만 필요
     
     breakfast_items = ["토스트 & 계란프라이", "우유 & 시리얼", "샐러드", "요거트", "과일", "빵 & 잼", "죽"]
     lunch_items = ["비빔밥", "된장국", "김치", "단무지", "불고기", "잡채", "제육볶음", "김치찌개", "냉면"]
@@ -316,28 +701,394 @@ def generate_dummy_data():
     return meal_list
 
 # 더미 데이터 생성 및 데이터베이스 저장
-def generate_dummy_data_and_save():
+def generate_dummy_data_and_save(school=DEFAULT_SCHOOL):
     meal_list = generate_dummy_data()
     
-    logger.info("더미 데이터 생성 완료, 데이터베이스에 저장 중...")
-    save_to_database(meal_list)
+    logger.info(f"[{school}] 더미 데이터 생성 완료, 데이터베이스에 저장 중...")
+    save_to_database(meal_list, school)
     return meal_list
 
+# ===== 게시글 파티션 관리 =====
+
+PARTITION_AHEAD_MONTHS = int(os.environ.get('PARTITION_AHEAD_MONTHS', 3))  # 미리 만들어 둘 파티션 개월 수
+ARCHIVE_AFTER_MONTHS = int(os.environ.get('ARCHIVE_AFTER_MONTHS', 12))  # 이보다 오래된 달은 archive 스키마로 분리 (0이면 보관 안 함)
+
+# 게시글/댓글/좋아요 월 파티션 생성 및 오래된 파티션 보관
+def maintain_partitions(ahead_months=PARTITION_AHEAD_MONTHS, archive_after_months=ARCHIVE_AFTER_MONTHS):
+    """다가올 달의 파티션을 미리 만들고 오래된 달의 파티션을 분리합니다. (init.sql의 함수 사용)"""
+    conn = None
+    try:
+        conn = psycopg2.connect(
+            host=DB_HOST,
+            database=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD
+        )
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT ensure_meal_partitions(CURRENT_DATE, (CURRENT_DATE + make_interval(months => %s))::date);",
+                (ahead_months,)
+            )
+            created = cur.fetchone()[0]
+            archived = 0
+            if archive_after_months > 0:
+                cur.execute("SELECT archive_meal_partitions(%s);", (archive_after_months,))
+                archived = cur.fetchone()[0]
+        conn.commit()
+        logger.info(f"파티션 관리 완료: 생성 {created}개, 보관 {archived}개")
+        return created, archived
+    except Exception as e:
+        logger.error(f"파티션 관리 오류: {e}")
+        if conn:
+            conn.rollback()
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+# ===== 크롤링 스케줄러 =====
+
+# 크롤링 주기 (분)
+INTERVAL_EARLY_WEEK = int(os.environ.get('CRAWL_INTERVAL_EARLY_WEEK', 60))  # 월/화요일
+INTERVAL_WEEKDAY = int(os.environ.get('CRAWL_INTERVAL_WEEKDAY', 180))  # 수~금요일
+INTERVAL_IDLE = int(os.environ.get('CRAWL_INTERVAL_IDLE', 720))  # 주말/휴일
+INTERVAL_AFTER_CHANGE = int(os.environ.get('CRAWL_INTERVAL_AFTER_CHANGE', 20))  # 메뉴 변경 감지 직후
+CHANGE_BOOST_WINDOW = int(os.environ.get('CRAWL_CHANGE_BOOST_WINDOW', 120))  # 변경 후 자주 확인할 시간
+TRIGGER_MIN_GAP = int(os.environ.get('CRAWL_TRIGGER_MIN_GAP', 60))  # 수동 요청 간 최소 간격(초)
+
+# 백엔드가 NOTIFY로 즉시 크롤링을 요청하는 채널 (payload: 캠퍼스 키, 비어 있으면 전체)
+CRAWL_CHANNEL = 'crawl_requests'
+
+class CrawlScheduler:
+    """다음 크롤링 시각까지 정확히 대기하다가 실행하고, NOTIFY 요청이 오면 즉시 실행합니다.
+
+    월/화요일이나 메뉴 변경 직후에는 자주, 주말과 휴일에는 드물게 크롤링하며
+    주기와 관계없이 자정에는 항상 한 번 크롤링합니다.
+    """
+    
+    def __init__(self, crawl=crawl_all_sources):
+        self.crawl = crawl
+        self.conn = None
+        self.last_change = None
+        self.last_run = None
+        self.holidays = set()
+        self.partitions_checked = None  # 파티션 관리를 마지막으로 실행한 날짜
+    
+    def next_interval(self, now):
+        """현재 상황에 맞는 크롤링 주기를 반환"""
+        if self.last_change and now - self.last_change < timedelta(minutes=CHANGE_BOOST_WINDOW):
+            return timedelta(minutes=INTERVAL_AFTER_CHANGE)
+        if now.weekday() >= 5 or now.strftime('%Y-%m-%d') in self.holidays:
+            return timedelta(minutes=INTERVAL_IDLE)
+        if now.weekday() <= 1:
+            return timedelta(minutes=INTERVAL_EARLY_WEEK)
+        return timedelta(minutes=INTERVAL_WEEKDAY)
+    
+    def next_due(self, now):
+        """다음 크롤링 시각 (다음 자정을 넘지 않음)"""
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return min(now + self.next_interval(now), next_midnight)
+    
+    def listen(self):
+        """NOTIFY 수신용 연결을 준비합니다. 실패하면 다음 대기 때 다시 시도합니다."""
+        if self.conn is not None:
+            return True
+        try:
+            conn = psycopg2.connect(
+                host=DB_HOST,
+                database=DB_NAME,
+                user=DB_USER,
+                password=DB_PASSWORD
+            )
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CRAWL_CHANNEL};")
+            self.conn = conn
+            logger.info(f"크롤링 요청 채널 수신 대기: {CRAWL_CHANNEL}")
+            return True
+        except Exception as e:
+            logger.warning(f"크롤링 요청 채널 연결 실패: {e}")
+            return False
+    
+    def wait(self, timeout):
+        """timeout초 동안 크롤링 요청을 기다리고, 받은 payload 목록을 반환합니다."""
+        if not self.listen():
+            # 수신 연결이 없으면 정해진 시각까지 대기만 (재연결은 최대 30초마다)
+            time.sleep(min(timeout, 30))
+            return []
+        
+        try:
+            if select.select([self.conn], [], [], timeout) == ([], [], []):
+                return []
+            self.conn.poll()
+            payloads = [notify.payload for notify in self.conn.notifies]
+            self.conn.notifies.clear()
+            return payloads
+        except Exception as e:
+            logger.warning(f"크롤링 요청 수신 오류, 재연결합니다: {e}")
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+            return []
+    
+    def run_once(self, schools=None):
+        """크롤링을 실행하고 결과로 주기 조정 정보를 갱신합니다."""
+        sources = load_sources()
+        if schools:
+            sources = [s for s in sources if s['school'] in schools]
+            if not sources:
+                logger.warning(f"요청된 캠퍼스를 찾을 수 없습니다: {', '.join(sorted(schools))}")
+                return
+        
+        self.last_run = time.monotonic()
+        results = self.crawl(sources)
+        
+        now = datetime.now()
+        # 파티션 관리는 하루 한 번 (자정 크롤링 때)
+        if self.partitions_checked != now.date():
+            if maintain_partitions() is not None:
+                self.partitions_checked = now.date()
+        if any(r['changed'] for r in results):
+            self.last_change = now
+            logger.info("메뉴 변경 감지, 당분간 크롤링 주기를 줄입니다.")
+        for r in results:
+            self.holidays.update(r['holidays'])
+        # 지난 날짜의 휴일 정보는 정리
+        today = now.strftime('%Y-%m-%d')
+        self.holidays = {d for d in self.holidays if d >= today}
+    
+    def run_forever(self):
+        self.run_once()
+        due = self.next_due(datetime.now())
+        pending = None  # 수동 요청된 캠퍼스 (빈 set이면 전체)
+        
+        while True:
+            logger.info(f"다음 크롤링 예정: {due.strftime('%Y-%m-%d %H:%M:%S')}")
+            timeout = max(0.0, (due - datetime.now()).total_seconds())
+            payloads = self.wait(timeout)
+            
+            if payloads:
+                logger.info(f"크롤링 요청 수신: {payloads}")
+                # 전체 요청(빈 payload 또는 '*')이 하나라도 있으면 전체 크롤링
+                requested = set() if any(p in ('', '*') for p in payloads) else set(payloads)
+                if pending is None:
+                    pending = requested
+                elif pending and requested:
+                    pending |= requested
+                else:
+                    pending = set()
+                
+                # 연속 요청은 최소 간격을 두고 한 번에 처리
+                since_last = time.monotonic() - self.last_run
+                if since_last < TRIGGER_MIN_GAP:
+                    due = min(due, datetime.now() + timedelta(seconds=TRIGGER_MIN_GAP - since_last))
+                    continue
+                self.run_once(pending or None)
+                pending = None
+            elif datetime.now() >= due:
+                self.run_once(pending or None)
+                pending = None
+            else:
+                continue
+            
+            due = self.next_due(datetime.now())
+
+# ===== 과거 식단 백필 =====
+
+BACKFILL_CONCURRENCY = int(os.environ.get('BACKFILL_CONCURRENCY', 4))  # 동시에 가져올 주 수
+BACKFILL_BATCH_WEEKS = int(os.environ.get('BACKFILL_BATCH_WEEKS', 8))  # 한 번에 저장할 주 수
+
+# 기간 내 주 시작일(월요일) 목록
+def week_starts(date_from, date_to):
+    monday = date_from - timedelta(days=date_from.weekday())
+    while monday <= date_to:
+        yield monday
+        monday += timedelta(weeks=1)
+
+# 특정 주의 식단 페이지 URL
+def build_week_url(source, week_start):
+    """source의 week_url 템플릿({date} = 해당 주 월요일)으로 URL을 만듭니다.
+
+    사이트가 주 지정 파라미터를 무시하면 이번주 식단이 과거 주로 저장되므로, 파라미터를 추측하지 않고
+    week_url이 없으면 ValueError를 발생시킵니다.
+    """
+    template = source.get('week_url')
+    if not template:
+        raise ValueError(f"[{source['school']}] 백필에는 week_url 설정이 필요합니다.")
+    return template.format(date=week_start.strftime('%Y-%m-%d'))
+
+# 특정 주 식단 가져오기
+def fetch_week(source, week_start):
+    """한 주의 식단 페이지를 가져와 파싱합니다.
+
+    식단표가 없거나, 받은 페이지가 요청한 주의 식단인지 확인할 수 없으면 예외를 발생시켜
+    해당 주가 완료로 기록되지 않게 합니다. (요일만 있는 행은 어느 주인지 알 수 없으므로 거부)
+    """
+    url = build_week_url(source, week_start)
+    response = host_throttle.get(url, timeout=source.get('timeout', CRAWL_TIMEOUT))
+    response.raise_for_status()
+    
+    meal_list = parse_menu_html(response.content, week_start=week_start)
+    if meal_list is None:
+        raise ValueError(f"식단표를 찾을 수 없습니다: {url}")
+    
+    week_end = week_start + timedelta(days=6)
+    for meal in meal_list:
+        menu_date = meal['menu_date']
+        if menu_date.weekday_only:
+            raise ValueError(f"날짜 없이 요일만 있는 행이 있어 {week_start} 주 식단인지 확인할 수 없습니다: {url}")
+        if not week_start <= menu_date.date <= week_end:
+            raise ValueError(f"요청한 주({week_start} ~ {week_end})가 아닌 {menu_date.iso} 식단이 있습니다: {url}")
+    return meal_list, len(response.content)
+
+# 완료된 주 목록 조회
+def load_backfill_checkpoints(conn, school, date_from, date_to):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT week_start FROM crawl_backfill_progress "
+            "WHERE school = %s AND week_start BETWEEN %s AND %s;",
+            (school, date_from - timedelta(days=6), date_to)
+        )
+        return {row[0] for row in cur.fetchall()}
+
+# 백필 배치 저장
+def flush_backfill_batch(conn, school, batch):
+    """여러 주의 메뉴를 한 번에 upsert하고, 같은 트랜잭션에서 완료된 주를 기록합니다."""
+    rows = {}
+    for _, meal_list in batch:
+        rows.update(build_menu_rows(meal_list))
+    
+    with conn.cursor() as cur:
+        upsert_menu_rows(cur, school, rows)
+        execute_values(
+            cur,
+            "INSERT INTO crawl_backfill_progress (school, week_start, row_count) VALUES %s "
+            "ON CONFLICT (school, week_start) DO UPDATE "
+            "SET row_count = EXCLUDED.row_count, completed_at = CURRENT_TIMESTAMP;",
+            [(school, week_start, len(meal_list)) for week_start, meal_list in batch]
+        )
+    conn.commit()
+    
+    logger.info(f"[{school}] 백필 {len(batch)}주 저장 ({len(rows)}행)")
+    return len(rows)
+
+# 과거 식단 백필 실행
+def run_backfill(date_from, date_to, schools=None, concurrency=BACKFILL_CONCURRENCY,
+                 batch_weeks=BACKFILL_BATCH_WEEKS):
+    """기간 내 주별 식단을 병렬로 가져와 배치로 저장합니다.
+
+    완료된 주는 crawl_backfill_progress에 기록되므로 중단 후 다시 실행하면 남은 주만 처리합니다.
+    백필 중에는 더미 데이터를 만들지 않으며, 실패한 주는 기록하지 않아 다음 실행에서 다시 시도합니다.
+    """
+    sources = [s for s in load_sources() if not schools or s['school'] in schools]
+    summary = {'pages': 0, 'rows': 0, 'bytes': 0, 'failed': 0, 'skipped': 0}
+    started = time.monotonic()
+    interrupted = False
+    
+    conn = psycopg2.connect(
+        host=DB_HOST,
+        database=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD
+    )
+    try:
+        for source in sources:
+            school = source['school']
+            if not source.get('week_url'):
+                logger.error(f"[{school}] week_url 설정이 없어 백필하지 않습니다.")
+                summary['failed'] += 1
+                continue
+            done = load_backfill_checkpoints(conn, school, date_from, date_to)
+            pending = [w for w in week_starts(date_from, date_to) if w not in done]
+            summary['skipped'] += len(done)
+            logger.info(f"[{school}] 백필 대상 {len(pending)}주 (완료된 {len(done)}주 제외)")
+            
+            batch = []
+            executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+            try:
+                futures = {executor.submit(fetch_week, source, w): w for w in pending}
+                for future in as_completed(futures):
+                    week_start = futures[future]
+                    try:
+                        meal_list, size = future.result()
+                    except Exception as e:
+                        summary['failed'] += 1
+                        logger.warning(f"[{school}] {week_start} 주 백필 실패: {e}")
+                        continue
+                    
+                    summary['pages'] += 1
+                    summary['bytes'] += size
+                    batch.append((week_start, meal_list))
+                    if len(batch) >= batch_weeks:
+                        summary['rows'] += flush_backfill_batch(conn, school, batch)
+                        batch = []
+            except KeyboardInterrupt:
+                interrupted = True
+                logger.warning("백필 중단 요청, 가져온 데이터까지 저장합니다.")
+            finally:
+                executor.shutdown(wait=not interrupted, cancel_futures=True)
+                if batch:
+                    summary['rows'] += flush_backfill_batch(conn, school, batch)
+            
+            if interrupted:
+                break
+    finally:
+        conn.close()
+    
+    elapsed = max(time.monotonic() - started, 1e-9)
+    print(
+        f"백필 {'중단' if interrupted else '완료'}: {summary['pages']}페이지, {summary['rows']}행, "
+        f"실패 {summary['failed']}주, 건너뜀 {summary['skipped']}주, {elapsed:.1f}초 "
+        f"({summary['pages'] / elapsed:.2f} pages/s, {summary['rows'] / elapsed:.1f} rows/s, "
+        f"{summary['bytes'] / elapsed / 1024:.1f} KiB/s)"
+    )
+    return summary
+
+# 백필 명령 처리
+def backfill_main(argv):
+    parser = argparse.ArgumentParser(prog='crawler.py backfill', description='과거 식단 백필')
+    parser.add_argument('--from', dest='date_from', required=True,
+                        type=lambda v: datetime.strptime(v, '%Y-%m-%d').date(), help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='date_to', default=datetime.now().date(),
+                        type=lambda v: datetime.strptime(v, '%Y-%m-%d').date(), help='종료일 (YYYY-MM-DD, 기본값: 오늘)')
+    parser.add_argument('--school', action='append', help='대상 캠퍼스 (여러 번 지정 가능, 기본값: 전체)')
+    parser.add_argument('--concurrency', type=int, default=BACKFILL_CONCURRENCY, help='동시에 가져올 주 수')
+    parser.add_argument('--batch-weeks', type=int, default=BACKFILL_BATCH_WEEKS, help='한 번에 저장할 주 수')
+    args = parser.parse_args(argv)
+    
+    if not wait_for_db():
+        logger.error("데이터베이스에 연결할 수 없어 백필을 종료합니다.")
+        exit(1)
+    
+    summary = run_backfill(args.date_from, args.date_to, args.school, args.concurrency, args.batch_weeks)
+    exit(1 if summary['failed'] else 0)
+
 if __name__ == "__main__":
+    # 백필 모드: python crawler.py backfill --from 2024-03-01 [--to 2024-12-31]
+    if len(sys.argv) > 1 and sys.argv[1] == 'backfill':
+        backfill_main(sys.argv[2:])
+    
+    # 음식 색인 재생성: python crawler.py rebuild-items
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild-items':
+        if not wait_for_db():
+            exit(1)
+        rebuild_menu_items()
+        exit(0)
+    
+    # 파티션 관리: python crawler.py maintain-partitions
+    if len(sys.argv) > 1 and sys.argv[1] == 'maintain-partitions':
+        if not wait_for_db():
+            exit(1)
+        exit(0 if maintain_partitions() is not None else 1)
+    
     logger.info("크롤러 서비스 시작")
     
     # 데이터베이스 연결을 기다립니다
-    if not wait_for_db(max_retries=30, delay=5):
+    if not wait_for_db():
         logger.error("데이터베이스에 연결할 수 없어 크롤러를 종료합니다.")
         exit(1)
     
-    # 시작할 때 한 번 크롤링 실행
-    crawl_menu()
-    
-    # 매일 자정에 크롤링 스케줄링
-    schedule.every().day.at("00:00").do(crawl_menu)
-    
-    # 스케줄러 실행
-    while True:
-        schedule.run_pending()
-        time.sleep(600)  # 1분마다 스케줄 확인
\ No newline at end of file
+    # 시작할 때 한 번 크롤링 실행 후 스케줄러 실행
+    CrawlScheduler().run_forever()
\ No newline at end of file
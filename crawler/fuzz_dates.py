@@ -0,0 +1,119 @@
+# crawler/fuzz_dates.py - 날짜 셀 해석(resolve_menu_date) 무작위 검사
+#
+# 사용법: python fuzz_dates.py [검사 횟수] [시드]
+# 무작위 날짜를 사이트에서 쓰는 여러 형식(전체 날짜, 월/일, 요일 포함/미포함)으로 만들어
+#   - 올바른 날짜로 해석되는지
+#   - 요일 불일치, 연도를 정할 수 없는 날짜, 존재하지 않는 날짜, 알 수 없는 형식은 추측하지 않고 제외되는지
+# 확인합니다. 실패가 하나라도 있으면 종료 코드 1을 반환합니다.
+import logging
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from crawler import WEEKDAY_NAMES, resolve_menu_date
+
+# 전체 날짜 형식
+FULL_FORMATS = [
+    lambda d: f"{d.year}-{d.month:02d}-{d.day:02d}",
+    lambda d: f"{d.year}.{d.month}.{d.day}",
+    lambda d: f"{d.year}. {d.month:02d}. {d.day:02d}.",
+    lambda d: f"{d.year}/{d.month:02d}/{d.day:02d}",
+    lambda d: f"{d.year}년 {d.month}월 {d.day}일",
+]
+
+# 연도 없는 월/일 형식
+MONTH_DAY_FORMATS = [
+    lambda d: f"{d.month:02d}/{d.day:02d}",
+    lambda d: f"{d.month}.{d.day}",
+    lambda d: f"{d.month:02d}-{d.day:02d}",
+    lambda d: f"{d.month}월 {d.day}일",
+    lambda d: f"{d.month}월{d.day}일",
+]
+
+# 요일 표기 (날짜 앞/뒤, <br> 제거 후 붙어 있는 경우 포함)
+WEEKDAY_FORMATS = [
+    lambda text, w: f"{w}요일{text}",
+    lambda text, w: f"{w}요일 {text}",
+    lambda text, w: f"{text}({w})",
+    lambda text, w: f"{text} ({w})",
+    lambda text, w: f"{text} {w}요일",
+]
+
+GARBAGE = ["", "-", "미정", "식단 없음", "2025", "13/45", "6월", "제 3주차"]
+
+
+def random_day(rng, around, spread):
+    return around + timedelta(days=rng.randint(-spread, spread))
+
+
+def with_weekday(rng, text, weekday):
+    return rng.choice(WEEKDAY_FORMATS)(text, WEEKDAY_NAMES[weekday])
+
+
+def check(cell, expected, failures, **kwargs):
+    """expected가 None이면 제외되어야 하고, 날짜면 그 날짜로 해석되어야 함"""
+    menu_date, reason = resolve_menu_date(cell, **kwargs)
+    actual = menu_date.date if menu_date else None
+    if actual != expected:
+        failures.append(f"{cell!r} {kwargs}: 기대 {expected}, 결과 {actual} ({reason})")
+        return
+    if menu_date and (menu_date.iso != expected.isoformat()
+                      or menu_date.weekday != expected.weekday()
+                      or menu_date.is_weekend != (expected.weekday() >= 5)):
+        failures.append(f"{cell!r}: MenuDate 필드 불일치 {menu_date}")
+
+
+def run(rng, failures):
+    today = date(2020, 1, 1) + timedelta(days=rng.randint(0, 365 * 10))
+    week_start = rng.choice([None, today - timedelta(days=today.weekday())])
+    reference = week_start or today
+    kwargs = {'week_start': week_start, 'today': today}
+
+    # 전체 날짜: 기준일과 관계없이 그대로 해석
+    day = random_day(rng, today, 3000)
+    text = rng.choice(FULL_FORMATS)(day)
+    check(text, day, failures, **kwargs)
+    check(with_weekday(rng, text, day.weekday()), day, failures, **kwargs)
+    check(with_weekday(rng, text, (day.weekday() + rng.randint(1, 6)) % 7), None, failures, **kwargs)
+
+    # 월/일: 기준일에 가장 가까운 연도로 해석, 요일이 맞는 연도가 반년 넘게 떨어져 있으면 제외
+    day = random_day(rng, reference, 150)
+    text = rng.choice(MONTH_DAY_FORMATS)(day)
+    check(text, day, failures, **kwargs)
+    check(with_weekday(rng, text, day.weekday()), day, failures, **kwargs)
+    check(with_weekday(rng, text, (day.weekday() + rng.randint(1, 6)) % 7), None, failures, **kwargs)
+
+    # 요일만: 기준 주(없으면 이번주) 월요일부터 계산
+    weekday = rng.randint(0, 6)
+    monday = reference - timedelta(days=reference.weekday())
+    check(rng.choice([f"{WEEKDAY_NAMES[weekday]}요일", f"({WEEKDAY_NAMES[weekday]})"]),
+          monday + timedelta(days=weekday), failures, **kwargs)
+
+    # 존재하지 않는 날짜 / 알 수 없는 형식
+    check(f"{today.year}-02-30", None, failures, **kwargs)
+    check(f"{today.year}.13.01", None, failures, **kwargs)
+    check(rng.choice(GARBAGE), None, failures, **kwargs)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+
+    logging.disable(logging.CRITICAL)
+
+    failures = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        run(rng, failures)
+    elapsed = time.perf_counter() - start
+
+    for failure in failures[:20]:
+        print(failure)
+    print(f"{iterations}회 검사 (시드 {seed}), 실패 {len(failures)}건, {elapsed / iterations * 1000:.3f} ms/회")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
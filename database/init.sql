@@ -2,14 +2,94 @@
 -- 기존 테이블들
 CREATE TABLE IF NOT EXISTS meal_menu (
     id SERIAL PRIMARY KEY,
+    school VARCHAR(50) NOT NULL DEFAULT 'jungsu',
     date DATE NOT NULL,
     meal_type VARCHAR(10) NOT NULL,
-    content TEXT NOT NULL,
-    UNIQUE(date, meal_type)
+    content TEXT NOT NULL
 );
 
-CREATE TABLE IF NOT EXISTS posts (
+-- 기존 meal_menu 테이블에 캠퍼스 컬럼 추가 (없다면) 및 (date, meal_type) 유니크 제약을 캠퍼스 단위로 변경
+ALTER TABLE meal_menu ADD COLUMN IF NOT EXISTS school VARCHAR(50) NOT NULL DEFAULT 'jungsu';
+ALTER TABLE meal_menu DROP CONSTRAINT IF EXISTS meal_menu_date_meal_type_key;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_meal_menu_school_date_type ON meal_menu(school, date, meal_type);
+
+-- 메뉴를 음식 단위로 나눈 색인 (크롤러가 meal_menu 저장 시 함께 갱신)
+CREATE TABLE IF NOT EXISTS menu_items (
+    id SERIAL PRIMARY KEY,
+    school VARCHAR(50) NOT NULL,
+    date DATE NOT NULL,
+    meal_type VARCHAR(10) NOT NULL,
+    position SMALLINT NOT NULL,
+    dish VARCHAR(100) NOT NULL,
+    UNIQUE(school, date, meal_type, position)
+);
+
+-- 음식 이름 검색용 / 기간별 빈도 집계용 (index-only scan)
+CREATE INDEX IF NOT EXISTS idx_menu_items_dish ON menu_items(dish, school, date);
+CREATE INDEX IF NOT EXISTS idx_menu_items_school_type_date ON menu_items(school, meal_type, date, dish);
+
+-- 과거 식단 백필 진행 상황 (중단 후 재실행 시 완료된 주는 건너뜀)
+CREATE TABLE IF NOT EXISTS crawl_backfill_progress (
+    school VARCHAR(50) NOT NULL,
+    week_start DATE NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (school, week_start)
+);
+
+-- 크롤링 실행 기록 (단계별 소요 시간, 처리량, 더미 데이터 사용/오류 여부)
+CREATE TABLE IF NOT EXISTS crawl_runs (
     id SERIAL PRIMARY KEY,
+    school VARCHAR(50) NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    fetch_ms REAL,
+    parse_ms REAL,
+    save_ms REAL,
+    total_ms REAL NOT NULL,
+    bytes_fetched INTEGER,
+    rows_parsed INTEGER,
+    rows_skipped INTEGER,
+    rows_inserted INTEGER,
+    rows_updated INTEGER,
+    rows_unchanged INTEGER,
+    fallback BOOLEAN NOT NULL DEFAULT FALSE,
+    error TEXT
+);
+
+-- 날짜를 해석할 수 없어 제외한 행 수
+ALTER TABLE crawl_runs ADD COLUMN IF NOT EXISTS rows_skipped INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_crawl_runs_school_started ON crawl_runs(school, started_at DESC);
+
+-- ===== 게시글/댓글/좋아요: meal_date 기준 월 단위 파티션 =====
+-- 각 테이블에 meal_date를 두어 같은 달의 게시글/댓글/좋아요가 같은 달 파티션에 저장됨
+
+-- 파티션 도입 전의 일반 테이블이 있으면 *_legacy로 이름을 바꿔 두고, 아래에서 데이터를 옮긴 뒤 삭제
+DO $$
+DECLARE
+    t TEXT;
+    idx TEXT;
+    seq TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['comment_likes', 'post_likes', 'comments', 'posts'] LOOP
+        IF EXISTS (SELECT 1 FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                   WHERE n.nspname = 'public' AND c.relname = t AND c.relkind = 'r') THEN
+            EXECUTE format('ALTER TABLE %I RENAME TO %I', t, t || '_legacy');
+            -- 새 테이블과 이름이 겹치지 않도록 인덱스/시퀀스 이름도 변경
+            FOR idx IN SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                       WHERE i.indrelid = (t || '_legacy')::regclass LOOP
+                EXECUTE format('ALTER INDEX %I RENAME TO %I', idx, idx || '_legacy');
+            END LOOP;
+            seq := pg_get_serial_sequence(t || '_legacy', 'id');
+            IF seq IS NOT NULL THEN
+                EXECUTE format('ALTER SEQUENCE %s RENAME TO %I', seq, t || '_legacy_id_seq');
+            END IF;
+        END IF;
+    END LOOP;
+END $$;
+
+CREATE TABLE IF NOT EXISTS posts (
+    id SERIAL,
     title VARCHAR(255) NOT NULL,
     content TEXT NOT NULL,
     author VARCHAR(100) NOT NULL,
@@ -17,40 +97,242 @@ CREATE TABLE IF NOT EXISTS posts (
     meal_type VARCHAR(10) NOT NULL,
     image_url TEXT,
     likes INTEGER DEFAULT 0,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    PRIMARY KEY (id, meal_date)
+) PARTITION BY RANGE (meal_date);
 
 CREATE TABLE IF NOT EXISTS comments (
-    id SERIAL PRIMARY KEY,
-    post_id INTEGER REFERENCES posts(id) ON DELETE CASCADE,
+    id SERIAL,
+    post_id INTEGER NOT NULL,
+    meal_date DATE NOT NULL,  -- 게시글의 meal_date
     content TEXT NOT NULL,
     author VARCHAR(100) NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
+    PRIMARY KEY (id, meal_date),
+    CONSTRAINT comments_post_fk FOREIGN KEY (post_id, meal_date)
+        REFERENCES posts(id, meal_date) ON DELETE CASCADE
+) PARTITION BY RANGE (meal_date);
 
 CREATE TABLE IF NOT EXISTS post_likes (
-    id SERIAL PRIMARY KEY,
-    post_id INTEGER REFERENCES posts(id) ON DELETE CASCADE,
+    id SERIAL,
+    post_id INTEGER NOT NULL,
+    meal_date DATE NOT NULL,  -- 게시글의 meal_date
     user_identifier VARCHAR(255) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(post_id, user_identifier)
-);
+    PRIMARY KEY (id, meal_date),
+    UNIQUE(post_id, user_identifier, meal_date),
+    CONSTRAINT post_likes_post_fk FOREIGN KEY (post_id, meal_date)
+        REFERENCES posts(id, meal_date) ON DELETE CASCADE
+) PARTITION BY RANGE (meal_date);
 
 -- 새로 추가된 댓글 좋아요 테이블
 CREATE TABLE IF NOT EXISTS comment_likes (
-    id SERIAL PRIMARY KEY,
-    comment_id INTEGER REFERENCES comments(id) ON DELETE CASCADE,
+    id SERIAL,
+    comment_id INTEGER NOT NULL,
+    meal_date DATE NOT NULL,  -- 댓글이 달린 게시글의 meal_date
     user_identifier VARCHAR(255) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(comment_id, user_identifier)
-);
+    PRIMARY KEY (id, meal_date),
+    UNIQUE(comment_id, user_identifier, meal_date),
+    CONSTRAINT comment_likes_comment_fk FOREIGN KEY (comment_id, meal_date)
+        REFERENCES comments(id, meal_date) ON DELETE CASCADE
+) PARTITION BY RANGE (meal_date);
+
+-- 월 파티션 범위를 벗어난 날짜용 기본 파티션
+CREATE TABLE IF NOT EXISTS posts_default PARTITION OF posts DEFAULT;
+CREATE TABLE IF NOT EXISTS comments_default PARTITION OF comments DEFAULT;
+CREATE TABLE IF NOT EXISTS post_likes_default PARTITION OF post_likes DEFAULT;
+CREATE TABLE IF NOT EXISTS comment_likes_default PARTITION OF comment_likes DEFAULT;
+
+-- 보관(분리)된 파티션이 옮겨지는 스키마 (archive.posts_2024_03 처럼 직접 조회 가능)
+CREATE SCHEMA IF NOT EXISTS archive;
+
+-- from_date ~ to_date 사이 각 달의 파티션 생성 (이미 있거나 보관된 달은 건너뜀)
+-- 파티션이 없던 동안 기본 파티션에 들어간 그 달의 데이터는 새 파티션으로 옮김
+CREATE OR REPLACE FUNCTION ensure_meal_partitions(from_date DATE, to_date DATE) RETURNS INTEGER AS $$
+DECLARE
+    tables TEXT[] := ARRAY['posts', 'comments', 'post_likes', 'comment_likes'];
+    month DATE := date_trunc('month', from_date)::date;
+    next_month DATE;
+    t TEXT;
+    part TEXT;
+    missing TEXT[];
+    archived BOOLEAN;
+    has_rows BOOLEAN;
+    stranded BOOLEAN;
+    created INTEGER := 0;
+BEGIN
+    WHILE month <= to_date LOOP
+        next_month := (month + INTERVAL '1 month')::date;
+        missing := ARRAY[]::TEXT[];
+        archived := FALSE;
+        stranded := FALSE;
+        FOREACH t IN ARRAY tables LOOP
+            part := t || '_' || to_char(month, 'YYYY_MM');
+            IF to_regclass('archive.' || part) IS NOT NULL THEN
+                archived := TRUE;
+            ELSIF to_regclass('public.' || part) IS NULL THEN
+                missing := missing || t;
+                EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE meal_date >= %L AND meal_date < %L)',
+                               t || '_default', month, next_month)
+                INTO has_rows;
+                stranded := stranded OR has_rows;
+            END IF;
+        END LOOP;
+        
+        IF stranded AND archived THEN
+            -- 보관된 달은 restore_meal_partitions로 되돌린 뒤 다시 실행
+            RAISE WARNING '% 는 보관된 달이라 기본 파티션의 데이터를 옮기지 않습니다', to_char(month, 'YYYY-MM');
+            missing := ARRAY[]::TEXT[];
+            stranded := FALSE;
+        ELSIF stranded THEN
+            -- 기본 파티션에 그 달의 행이 있으면 파티션을 만들 수 없으므로 네 테이블의 그 달 데이터를
+            -- 임시 테이블로 옮기고 자식 -> 부모 순으로 지운 뒤(ON DELETE CASCADE로 지워지는 행이 없도록)
+            -- 파티션을 만들고 부모 -> 자식 순으로 다시 넣음. 요약 통계 트리거의 증감은 서로 상쇄됨
+            RAISE NOTICE '% 기본 파티션의 데이터를 월 파티션으로 옮깁니다', to_char(month, 'YYYY-MM');
+            FOREACH t IN ARRAY tables LOOP
+                EXECUTE format('CREATE TEMP TABLE %I ON COMMIT DROP AS SELECT * FROM %I WHERE meal_date >= %L AND meal_date < %L',
+                               'moving_' || t, t, month, next_month);
+            END LOOP;
+            FOREACH t IN ARRAY ARRAY['comment_likes', 'post_likes', 'comments', 'posts'] LOOP
+                EXECUTE format('DELETE FROM %I WHERE meal_date >= %L AND meal_date < %L', t, month, next_month);
+            END LOOP;
+        END IF;
+        
+        FOREACH t IN ARRAY missing LOOP
+            EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                           t || '_' || to_char(month, 'YYYY_MM'), t, month, next_month);
+            created := created + 1;
+        END LOOP;
+        
+        IF stranded THEN
+            FOREACH t IN ARRAY tables LOOP
+                EXECUTE format('INSERT INTO %I SELECT * FROM %I', t, 'moving_' || t);
+                EXECUTE format('DROP TABLE %I', 'moving_' || t);
+            END LOOP;
+        END IF;
+        month := next_month;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- keep_months개월보다 오래된 월 파티션을 분리하여 archive 스키마로 이동
+-- 좋아요 -> 댓글 -> 게시글 순으로 분리하고, 보관 테이블의 외래 키는 제거
+CREATE OR REPLACE FUNCTION archive_meal_partitions(keep_months INTEGER) RETURNS INTEGER AS $$
+DECLARE
+    cutoff DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => keep_months))::date;
+    part RECORD;
+    fk TEXT;
+    archived INTEGER := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname::text AS name, p.relname::text AS parent
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+          AND p.relname IN ('posts', 'comments', 'post_likes', 'comment_likes')
+          AND c.relname ~ '_[0-9]{4}_[0-9]{2}$'
+          AND to_date(right(c.relname, 7), 'YYYY_MM') < cutoff
+        ORDER BY array_position(ARRAY['comment_likes', 'post_likes', 'comments', 'posts'], p.relname::text), c.relname
+    LOOP
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', part.parent, part.name);
+        FOR fk IN SELECT conname FROM pg_constraint
+                  WHERE conrelid = ('public.' || part.name)::regclass AND contype = 'f' LOOP
+            EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', part.name, fk);
+        END LOOP;
+        EXECUTE format('ALTER TABLE %I SET SCHEMA archive', part.name);
+        archived := archived + 1;
+    END LOOP;
+    RETURN archived;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 보관된 달의 파티션을 다시 연결 (게시글 -> 댓글 -> 좋아요 순)
+-- 보관할 때 제거한 외래 키는 ATTACH가 부모 테이블에서 다시 복제하지만(PostgreSQL 12+),
+-- 빠진 것이 있으면 직접 다시 추가하여 되돌린 달도 항상 외래 키가 검사되도록 함
+CREATE OR REPLACE FUNCTION restore_meal_partitions(month DATE) RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month)::date;
+    t TEXT;
+    part TEXT;
+    fk RECORD;
+    restored INTEGER := 0;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['posts', 'comments', 'post_likes', 'comment_likes'] LOOP
+        part := t || '_' || to_char(month_start, 'YYYY_MM');
+        IF to_regclass('archive.' || part) IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE archive.%I SET SCHEMA public', part);
+            EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                           t, part, month_start, (month_start + INTERVAL '1 month')::date);
+            FOR fk IN SELECT c.conname, pg_get_constraintdef(c.oid) AS definition
+                      FROM pg_constraint c
+                      WHERE c.conrelid = t::regclass AND c.contype = 'f' AND c.conparentid = 0
+                        AND NOT EXISTS (SELECT 1 FROM pg_constraint pc
+                                        WHERE pc.conrelid = ('public.' || part)::regclass
+                                          AND pc.contype = 'f' AND pc.conparentid = c.oid) LOOP
+                EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I %s', part, fk.conname, fk.definition);
+            END LOOP;
+            restored := restored + 1;
+        END IF;
+    END LOOP;
+    RETURN restored;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 지난달부터 3개월 뒤까지 파티션 준비 (이후에는 크롤러가 매일 확인)
+SELECT ensure_meal_partitions((CURRENT_DATE - INTERVAL '1 month')::date, (CURRENT_DATE + INTERVAL '3 months')::date);
 
--- 인덱스 추가
+-- 파티션 도입 전 데이터 이전
+DO $$
+BEGIN
+    IF to_regclass('public.posts_legacy') IS NOT NULL THEN
+        PERFORM ensure_meal_partitions(COALESCE((SELECT MIN(meal_date) FROM posts_legacy), CURRENT_DATE), CURRENT_DATE);
+        
+        INSERT INTO posts (id, title, content, author, meal_date, meal_type, image_url, likes, created_at, updated_at)
+        SELECT id, title, content, author, meal_date, meal_type, image_url, likes, created_at, updated_at
+        FROM posts_legacy;
+        
+        INSERT INTO comments (id, post_id, meal_date, content, author, created_at, updated_at)
+        SELECT c.id, c.post_id, p.meal_date, c.content, c.author, c.created_at, c.updated_at
+        FROM comments_legacy c JOIN posts_legacy p ON p.id = c.post_id;
+        
+        INSERT INTO post_likes (id, post_id, meal_date, user_identifier, created_at)
+        SELECT l.id, l.post_id, p.meal_date, l.user_identifier, l.created_at
+        FROM post_likes_legacy l JOIN posts_legacy p ON p.id = l.post_id;
+        
+        INSERT INTO comment_likes (id, comment_id, meal_date, user_identifier, created_at)
+        SELECT l.id, l.comment_id, p.meal_date, l.user_identifier, l.created_at
+        FROM comment_likes_legacy l
+        JOIN comments_legacy c ON c.id = l.comment_id
+        JOIN posts_legacy p ON p.id = c.post_id;
+        
+        PERFORM setval(pg_get_serial_sequence('posts', 'id'), COALESCE((SELECT MAX(id) FROM posts), 0) + 1, false);
+        PERFORM setval(pg_get_serial_sequence('comments', 'id'), COALESCE((SELECT MAX(id) FROM comments), 0) + 1, false);
+        PERFORM setval(pg_get_serial_sequence('post_likes', 'id'), COALESCE((SELECT MAX(id) FROM post_likes), 0) + 1, false);
+        PERFORM setval(pg_get_serial_sequence('comment_likes', 'id'), COALESCE((SELECT MAX(id) FROM comment_likes), 0) + 1, false);
+        
+        DROP TABLE comment_likes_legacy, post_likes_legacy, comments_legacy, posts_legacy;
+    END IF;
+END $$;
+
+-- 인덱스 추가 (파티션별로 생성되므로 인덱스 크기는 보관 전 기간만큼으로 유지됨)
 CREATE INDEX IF NOT EXISTS idx_posts_meal_date_type ON posts(meal_date, meal_type);
 CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments(post_id);
 CREATE INDEX IF NOT EXISTS idx_post_likes_post_id ON post_likes(post_id);
 CREATE INDEX IF NOT EXISTS idx_comment_likes_comment_id ON comment_likes(comment_id);
 
+-- 작성자별 최신순 목록 (내 게시글/내 댓글)
+CREATE INDEX IF NOT EXISTS idx_posts_author_created ON posts(author, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_comments_author_created ON comments(author, created_at, id);
+
+-- 이미지 후처리가 끝났을 때 그 이미지를 쓰는 게시글 목록 찾기
+CREATE INDEX IF NOT EXISTS idx_posts_image_url ON posts(image_url) WHERE image_url IS NOT NULL;
+
 
 -- 사용자 테이블
 CREATE TABLE IF NOT EXISTS users (
@@ -79,3 +361,131 @@ ALTER TABLE comments ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
 -- 인덱스 추가 (성능 향상)
 CREATE INDEX IF NOT EXISTS idx_user_sessions_token ON user_sessions(session_token);
 CREATE INDEX IF NOT EXISTS idx_user_sessions_expires ON user_sessions(expires_at);
+
+-- 멱등 키 (Idempotency-Key 헤더로 재시도된 생성 요청에 첫 응답을 다시 돌려줌)
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    owner VARCHAR(64) NOT NULL,  -- 세션 토큰 해시 또는 클라이언트 주소
+    idempotency_key VARCHAR(255) NOT NULL,
+    endpoint VARCHAR(100) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INTEGER,  -- NULL이면 첫 요청 처리 중
+    mimetype VARCHAR(100),
+    response_body BYTEA,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (owner, idempotency_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys(expires_at);
+
+-- 날짜/식사별 게시글·댓글·좋아요 수 요약 (월별 달력 화면용, 트리거로 갱신)
+CREATE TABLE IF NOT EXISTS daily_meal_stats (
+    meal_date DATE NOT NULL,
+    meal_type VARCHAR(10) NOT NULL,
+    posts INTEGER NOT NULL DEFAULT 0,
+    comments INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (meal_date, meal_type)
+);
+
+CREATE OR REPLACE FUNCTION bump_daily_meal_stats(d DATE, t VARCHAR, dp INTEGER, dc INTEGER, dl INTEGER) RETURNS VOID AS $$
+    INSERT INTO daily_meal_stats (meal_date, meal_type, posts, comments, likes)
+    VALUES (d, t, dp, dc, dl)
+    ON CONFLICT (meal_date, meal_type) DO UPDATE
+    SET posts = daily_meal_stats.posts + EXCLUDED.posts,
+        comments = daily_meal_stats.comments + EXCLUDED.comments,
+        likes = daily_meal_stats.likes + EXCLUDED.likes;
+$$ LANGUAGE sql;
+
+-- 게시글 작성/삭제 (삭제 시에는 함께 지워질 댓글/좋아요 수도 미리 차감)
+CREATE OR REPLACE FUNCTION daily_meal_stats_posts() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_daily_meal_stats(NEW.meal_date, NEW.meal_type, 1, 0, 0);
+        RETURN NEW;
+    END IF;
+    PERFORM bump_daily_meal_stats(OLD.meal_date, OLD.meal_type, -1,
+        -(SELECT COUNT(*) FROM comments WHERE post_id = OLD.id AND meal_date = OLD.meal_date)::int,
+        -(SELECT COUNT(*) FROM post_likes WHERE post_id = OLD.id AND meal_date = OLD.meal_date)::int);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 댓글/좋아요 추가/삭제 (게시글과 함께 삭제되는 경우는 게시글 트리거에서 이미 차감)
+-- 트리거 인자로 'comments' 또는 'likes'를 받음 (파티션에서 실행되므로 TG_TABLE_NAME은 파티션 이름)
+CREATE OR REPLACE FUNCTION daily_meal_stats_children() RETURNS TRIGGER AS $$
+DECLARE
+    row_post_id INTEGER;
+    row_meal_date DATE;
+    post_meal_type VARCHAR(10);
+    delta INTEGER := CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        row_post_id := NEW.post_id;
+        row_meal_date := NEW.meal_date;
+    ELSE
+        row_post_id := OLD.post_id;
+        row_meal_date := OLD.meal_date;
+    END IF;
+    
+    SELECT meal_type INTO post_meal_type FROM posts WHERE id = row_post_id AND meal_date = row_meal_date;
+    IF post_meal_type IS NOT NULL THEN
+        IF TG_ARGV[0] = 'comments' THEN
+            PERFORM bump_daily_meal_stats(row_meal_date, post_meal_type, 0, delta, 0);
+        ELSE
+            PERFORM bump_daily_meal_stats(row_meal_date, post_meal_type, 0, 0, delta);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_daily_meal_stats_posts_insert ON posts;
+CREATE TRIGGER trg_daily_meal_stats_posts_insert AFTER INSERT ON posts
+    FOR EACH ROW EXECUTE FUNCTION daily_meal_stats_posts();
+DROP TRIGGER IF EXISTS trg_daily_meal_stats_posts_delete ON posts;
+CREATE TRIGGER trg_daily_meal_stats_posts_delete BEFORE DELETE ON posts
+    FOR EACH ROW EXECUTE FUNCTION daily_meal_stats_posts();
+DROP TRIGGER IF EXISTS trg_daily_meal_stats_comments ON comments;
+CREATE TRIGGER trg_daily_meal_stats_comments AFTER INSERT OR DELETE ON comments
+    FOR EACH ROW EXECUTE FUNCTION daily_meal_stats_children('comments');
+DROP TRIGGER IF EXISTS trg_daily_meal_stats_post_likes ON post_likes;
+CREATE TRIGGER trg_daily_meal_stats_post_likes AFTER INSERT OR DELETE ON post_likes
+    FOR EACH ROW EXECUTE FUNCTION daily_meal_stats_children('likes');
+
+-- 요약 테이블 도입 전 데이터로 처음 한 번 채우기
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM daily_meal_stats) THEN
+        INSERT INTO daily_meal_stats (meal_date, meal_type, posts, comments, likes)
+        SELECT p.meal_date, p.meal_type, COUNT(*),
+               COALESCE(SUM(c.cnt), 0), COALESCE(SUM(l.cnt), 0)
+        FROM posts p
+        LEFT JOIN (SELECT post_id, meal_date, COUNT(*) AS cnt FROM comments GROUP BY post_id, meal_date) c
+            ON c.post_id = p.id AND c.meal_date = p.meal_date
+        LEFT JOIN (SELECT post_id, meal_date, COUNT(*) AS cnt FROM post_likes GROUP BY post_id, meal_date) l
+            ON l.post_id = p.id AND l.meal_date = p.meal_date
+        GROUP BY p.meal_date, p.meal_type;
+    END IF;
+END $$;
+
+-- ===== 업로드 이미지 후처리 작업 큐 =====
+-- 업로드 API는 파일 저장 후 작업만 등록하고 바로 응답, 백엔드의 작업 프로세스들이 SKIP LOCKED로 나눠 처리
+CREATE TABLE IF NOT EXISTS image_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    image_url VARCHAR(500) NOT NULL UNIQUE,  -- 업로드 원본 (/images/...)
+    status VARCHAR(10) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_after TIMESTAMPTZ NOT NULL DEFAULT now(),  -- 실패 후 재시도 가능 시각
+    locked_at TIMESTAMPTZ,  -- 처리 시작 시각 (오래되면 다른 워커가 다시 가져감)
+    width INTEGER,
+    height INTEGER,
+    processed_url VARCHAR(500),  -- 방향 보정/메타데이터 제거 후 다시 인코딩한 이미지 (/images/...)
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    finished_at TIMESTAMPTZ
+);
+
+-- 처리할 작업만 담는 부분 인덱스 (완료된 작업이 쌓여도 작업 가져오기 비용이 늘지 않도록)
+CREATE INDEX IF NOT EXISTS idx_image_jobs_queue ON image_jobs(id) WHERE status IN ('pending', 'processing');